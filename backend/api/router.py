@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from typing import Dict, List, Any, Optional
 from pydantic import BaseModel
 import json
@@ -14,7 +15,11 @@ class ScenarioParams(BaseModel):
     market_volatility: float = 0.3
     training_cost: float = 1.0
     sim_duration: int = 100
-    decision_freq: int = 5
+    decision_freq: int = 5  # Períodos entre ciclos de decisión (solo engine_mode="event")
+    engine_mode: str = "object"
+    log_level: str = "summary"
+    arrivals: str = "fixed"
+    salaries: Optional[Dict[str, float]] = None  # Coste por rol ("Manager", "Worker", "Innovator")
 
 class AgentConfig(BaseModel):
     quantity: int
@@ -35,6 +40,7 @@ class OrganizationalPoliciesInput(BaseModel):
     hierarchy_depth: int = 3
     span_of_control: int = 5
     task_allocation: str = "Skill-based"
+    task_capacity: int = 1  # Tareas nuevas por worker y período (Skill-based y Optimal)
     learning_method: str = "Mixed"
 
 class SimulationParams(BaseModel):
@@ -42,6 +48,15 @@ class SimulationParams(BaseModel):
     periods: int = 100
     random_seed: Optional[int] = None
     detailed_logging: bool = True
+    convergence_tolerance: Optional[float] = None  # None: ejecutar todos los períodos
+    convergence_window: int = 20
+    convergence_method: str = "relative"
+    profile: bool = False  # Medir el tiempo de cada fase de los períodos
+
+class ForkParams(BaseModel):
+    burn_in_periods: int = 0
+    policies: Dict[str, Any] = {}
+    random_seed: Optional[int] = None
 
 class OptimizationParams(BaseModel):
     target: str = "Balanced"
@@ -69,7 +84,11 @@ async def setup_scenario(params: ScenarioParams):
                 "market_volatility": params.market_volatility,
                 "training_cost": params.training_cost,
                 "sim_duration": params.sim_duration,
-                "decision_freq": params.decision_freq
+                "decision_freq": params.decision_freq,
+                "engine_mode": params.engine_mode,
+                "log_level": params.log_level,
+                "arrivals": params.arrivals,
+                "salaries": params.salaries
             }
         )
         
@@ -163,20 +182,33 @@ async def run_simulation(simulation_id: str, params: SimulationParams):
     simulator = simulations_store[simulation_id]
     
     try:
-        # Configurar semilla aleatoria si se proporciona
+        # Configurar semilla aleatoria propia de esta simulación si se proporciona
         if params.random_seed is not None:
-            import random
-            random.seed(params.random_seed)
+            simulator.seed(params.random_seed)
+        
+        # Criterio de parada anticipada por convergencia (opcional)
+        convergence = None
+        if params.convergence_tolerance is not None:
+            convergence = {
+                "tolerance": params.convergence_tolerance,
+                "window": params.convergence_window,
+                "method": params.convergence_method
+            }
         
         # Ejecutar simulación
         results = simulator.run(
             iterations=params.iterations,
-            periods=params.periods
+            periods=params.periods,
+            log_level="task" if params.detailed_logging else "summary",
+            convergence=convergence,
+            profile=params.profile
         )
         
         # Guardar solo los datos esenciales si no se requiere logging detallado
         if not params.detailed_logging:
             results["logs"] = results["logs"][-10:]  # Solo últimos 10 logs
+        else:
+            results["logs"] = list(results["logs"])
         
         # Añadir timestamp
         timestamp = datetime.now().isoformat()
@@ -205,6 +237,55 @@ async def run_simulation(simulation_id: str, params: SimulationParams):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/stream-simulation/{simulation_id}")
+async def stream_simulation(simulation_id: str, params: SimulationParams):
+    """Ejecuta una simulación enviando el resumen de cada período en cuanto se calcula (NDJSON)."""
+    if simulation_id not in simulations_store:
+        raise HTTPException(status_code=404, detail="Simulación no encontrada")
+    
+    simulator = simulations_store[simulation_id]
+    if not simulator.engine:
+        raise HTTPException(status_code=400, detail="El motor de simulación no ha sido inicializado")
+    
+    if params.random_seed is not None:
+        simulator.seed(params.random_seed)
+    
+    def period_lines():
+        # Una línea JSON por período; no se acumulan resultados en memoria
+        for summary in simulator.iter_run(
+            iterations=params.iterations,
+            periods=params.periods,
+            log_level="task" if params.detailed_logging else "summary"
+        ):
+            yield json.dumps(summary) + "\n"
+    
+    return StreamingResponse(period_lines(), media_type="application/x-ndjson")
+
+@router.post("/fork-simulation/{simulation_id}")
+async def fork_simulation(simulation_id: str, params: ForkParams):
+    """Bifurca una simulación desde su estado actual con políticas alternativas."""
+    if simulation_id not in simulations_store:
+        raise HTTPException(status_code=404, detail="Simulación no encontrada")
+    
+    simulator = simulations_store[simulation_id]
+    
+    try:
+        # Calentamiento compartido antes de bifurcar
+        if params.burn_in_periods > 0:
+            simulator.burn_in(params.burn_in_periods)
+        
+        forked = simulator.fork(params.policies, seed=params.random_seed)
+        simulations_store[forked.simulation_id] = forked
+        
+        return {
+            "simulation_id": forked.simulation_id,
+            "parent_id": simulation_id,
+            "period": forked.engine.current_period,
+            "message": "Simulación bifurcada correctamente"
+        }
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.post("/optimize-policies/{simulation_id}")
 async def optimize_policies(simulation_id: str, params: OptimizationParams):
     """Optimiza las políticas para una simulación específica."""
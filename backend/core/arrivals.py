@@ -0,0 +1,83 @@
+import numpy as np
+
+class ArrivalProcess:
+    """
+    Proceso de llegada de tareas.
+    
+    Determina cuántas tareas se generan por período a partir de una tasa base
+    (proporcional al tamaño de la organización). Todas las implementaciones
+    aceptan `size` para muestrear varios períodos o réplicas en una sola llamada.
+    """
+    
+    def sample(self, rng, base, size=None):
+        """
+        Muestrea el número de tareas que llegan.
+        
+        Args:
+            rng: Generador aleatorio de NumPy
+            base: Número medio de tareas por período
+            size: Número de muestras (None: un único entero)
+        
+        Returns:
+            int o np.ndarray: Número de tareas por muestra
+        """
+        raise NotImplementedError
+
+class FixedArrivals(ArrivalProcess):
+    """Llegada determinista: siempre la tasa base (comportamiento original)."""
+    
+    def sample(self, rng, base, size=None):
+        if size is None:
+            return int(base)
+        return np.full(size, int(base), dtype=np.int64)
+
+class PoissonArrivals(ArrivalProcess):
+    """Llegadas de Poisson con media igual a la tasa base por un factor."""
+    
+    def __init__(self, rate_factor=1.0):
+        self.rate_factor = rate_factor
+    
+    def sample(self, rng, base, size=None):
+        counts = rng.poisson(base * self.rate_factor, size)
+        return int(counts) if size is None else counts
+
+class BurstyArrivals(ArrivalProcess):
+    """
+    Llegadas en ráfagas (mezcla gamma-Poisson / binomial negativa).
+    
+    Conserva la media de la tasa base, con varianza base + base² / dispersion:
+    cuanto menor es la dispersión, más irregulares son las ráfagas.
+    """
+    
+    def __init__(self, dispersion=2.0):
+        self.dispersion = dispersion
+    
+    def sample(self, rng, base, size=None):
+        k = self.dispersion
+        counts = rng.negative_binomial(k, k / (k + base), size)
+        return int(counts) if size is None else counts
+
+# Procesos de llegada disponibles por nombre
+ARRIVAL_PROCESSES = {
+    "fixed": FixedArrivals,
+    "poisson": PoissonArrivals,
+    "bursty": BurstyArrivals
+}
+
+def make_arrival_process(arrivals=None):
+    """
+    Devuelve un proceso de llegada a partir de su nombre o de una instancia.
+    
+    Args:
+        arrivals: Nombre ("fixed", "poisson", "bursty"), instancia de ArrivalProcess o None
+    
+    Returns:
+        ArrivalProcess
+    """
+    if arrivals is None:
+        return FixedArrivals()
+    if isinstance(arrivals, ArrivalProcess):
+        return arrivals
+    if arrivals not in ARRIVAL_PROCESSES:
+        raise ValueError(f"Proceso de llegada desconocido: {arrivals}")
+    return ARRIVAL_PROCESSES[arrivals]()
@@ -0,0 +1,61 @@
+import pickle
+import zlib
+
+from backend.core.history import embedded_segments
+
+# Cabecera de los checkpoints binarios (formato y versión)
+CHECKPOINT_MAGIC = b"AFCK1"
+
+def snapshot(obj, compress=True):
+    """
+    Serializa el estado completo de un objeto de simulación a bytes.
+    
+    El checkpoint es autónomo: incluye el contenido de los segmentos del
+    historial volcados a disco, de modo que puede restaurarse en otro proceso.
+    
+    Args:
+        obj: Motor, simulador u otro objeto serializable con pickle
+        compress: Comprimir el resultado con zlib
+    
+    Returns:
+        bytes: Checkpoint binario
+    """
+    with embedded_segments():
+        data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    if compress:
+        return CHECKPOINT_MAGIC + b"z" + zlib.compress(data, 1)
+    return CHECKPOINT_MAGIC + b"r" + data
+
+def restore(data):
+    """
+    Reconstruye un objeto a partir de un checkpoint generado con snapshot.
+    
+    Args:
+        data: Bytes del checkpoint
+    
+    Returns:
+        Objeto restaurado
+    """
+    header = len(CHECKPOINT_MAGIC)
+    if data[:header] != CHECKPOINT_MAGIC:
+        raise ValueError("Formato de checkpoint no reconocido")
+    
+    payload = data[header + 1:]
+    if data[header:header + 1] == b"z":
+        payload = zlib.decompress(payload)
+    return pickle.loads(payload)
+
+def clone(obj):
+    """Copia en memoria el estado completo de un objeto (sin compresión; comparte los segmentos del historial)."""
+    return pickle.loads(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+def save_checkpoint(obj, path, compress=True):
+    """Guarda un checkpoint en un archivo y devuelve su ruta."""
+    with open(path, "wb") as f:
+        f.write(snapshot(obj, compress))
+    return path
+
+def load_checkpoint(path):
+    """Carga un objeto desde un archivo de checkpoint."""
+    with open(path, "rb") as f:
+        return restore(f.read())
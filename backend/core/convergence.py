@@ -0,0 +1,131 @@
+import numpy as np
+from scipy import stats
+
+# Métodos de detección de convergencia disponibles
+CONVERGENCE_METHODS = ("relative", "batch_means")
+
+class ConvergenceCriterion:
+    """
+    Regla de parada por convergencia de las métricas de la simulación.
+    
+    Se evalúa al final de cada período sobre una ventana móvil de las
+    métricas seguidas:
+    
+    - "relative": cambio relativo entre la media de la última ventana y la de
+      la ventana anterior.
+    - "batch_means": semiamplitud relativa del intervalo de confianza de la
+      media, calculada con medias por lotes sobre la última ventana.
+    
+    La simulación se considera estacionaria cuando el error de todas las
+    métricas queda por debajo de la tolerancia.
+    """
+    
+    def __init__(self, metrics=("productivity", "agent_satisfaction"), window=20, tolerance=0.01,
+                 method="relative", batches=5, confidence=0.95, min_periods=None):
+        """
+        Args:
+            metrics: Métricas que deben estabilizarse
+            window: Tamaño de la ventana móvil en períodos
+            tolerance: Error relativo máximo admitido
+            method: "relative" o "batch_means"
+            batches: Número de lotes de la ventana (solo batch_means)
+            confidence: Nivel de confianza del intervalo (solo batch_means)
+            min_periods: Períodos mínimos antes de evaluar (por defecto, los que necesita el método)
+        """
+        if method not in CONVERGENCE_METHODS:
+            raise ValueError(f"Método de convergencia desconocido: {method}")
+        if method == "batch_means" and not 2 <= batches <= window:
+            raise ValueError("El número de lotes debe estar entre 2 y el tamaño de la ventana")
+        
+        self.metrics = tuple(metrics)
+        self.window = window
+        self.tolerance = tolerance
+        self.method = method
+        self.batches = batches
+        self.confidence = confidence
+        
+        required = 2 * window if method == "relative" else window
+        self.min_periods = max(required, min_periods or 0)
+    
+    def estimate(self, values):
+        """
+        Estima el valor estacionario de una métrica y su error relativo.
+        
+        Args:
+            values: Serie de la métrica, un valor por período
+        
+        Returns:
+            tuple: (valor estimado, error relativo)
+        """
+        recent = values[-self.window:]
+        estimate = float(recent.mean())
+        
+        if self.method == "relative":
+            previous = float(values[-2 * self.window:-self.window].mean())
+            scale = max(abs(estimate), abs(previous))
+            error = abs(estimate - previous) / scale if scale > 0 else 0.0
+        else:
+            # Medias por lotes: los lotes consecutivos son aproximadamente independientes
+            size = self.window // self.batches
+            batch_means = recent[-size * self.batches:].reshape(self.batches, size).mean(axis=1)
+            quantile = stats.t.ppf((1 + self.confidence) / 2, self.batches - 1)
+            half_width = quantile * batch_means.std(ddof=1) / np.sqrt(self.batches)
+            error = half_width / abs(estimate) if estimate != 0 else float(half_width > 0)
+        
+        return estimate, error
+    
+    def check(self, store, start=0):
+        """
+        Indica si las métricas han convergido.
+        
+        Args:
+            store: MetricStore del motor
+            start: Primera fila de la ejecución actual
+        """
+        if len(store) - start < self.min_periods:
+            return False
+        
+        for name in self.metrics:
+            _, error = self.estimate(store[name][start:])
+            if error > self.tolerance:
+                return False
+        return True
+    
+    def report(self, store, start=0, converged_period=None):
+        """
+        Resume el estado de convergencia de una ejecución.
+        
+        Returns:
+            dict: Período de convergencia, valores estacionarios estimados y errores
+        """
+        steady_state = {}
+        errors = {}
+        if len(store) - start >= self.min_periods:
+            for name in self.metrics:
+                steady_state[name], errors[name] = self.estimate(store[name][start:])
+        
+        return {
+            "converged": converged_period is not None,
+            "converged_period": converged_period,
+            "periods_run": len(store) - start,
+            "method": self.method,
+            "tolerance": self.tolerance,
+            "steady_state": steady_state,
+            "errors": errors
+        }
+
+def make_convergence(convergence=None):
+    """
+    Devuelve un criterio de convergencia a partir de una instancia o de sus parámetros.
+    
+    Args:
+        convergence: ConvergenceCriterion, diccionario de parámetros o None (sin parada anticipada)
+    
+    Returns:
+        ConvergenceCriterion o None
+    """
+    if convergence is None or isinstance(convergence, ConvergenceCriterion):
+        return convergence
+    if isinstance(convergence, dict):
+        return ConvergenceCriterion(**convergence)
+    raise ValueError(f"Criterio de convergencia no válido: {convergence}")
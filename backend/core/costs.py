@@ -0,0 +1,63 @@
+from backend.models.agents import ROLE_MANAGER, ROLE_WORKER, ROLE_INNOVATOR, ROLE_NAMES
+
+# Coste por período de cada agente según su rol
+DEFAULT_SALARIES = {
+    ROLE_MANAGER: 10000,
+    ROLE_WORKER: 5000,
+    ROLE_INNOVATOR: 15000
+}
+
+class CostModel:
+    """
+    Modelo de costes e ingresos de la organización.
+    
+    La nómina se calcula una vez por plantilla y se reutiliza mientras no
+    cambie el número de agentes de cada rol, de modo que el cálculo
+    financiero de cada período es O(1).
+    """
+    
+    def __init__(self, salaries=None, base_revenue=50000, innovation_weight=0.2):
+        """
+        Args:
+            salaries: Coste por agente para cada rol (clave entera o nombre del rol)
+            base_revenue: Ingreso con productividad y calidad máximas
+            innovation_weight: Peso del impacto de las innovaciones en los ingresos
+        """
+        self.salaries = dict(DEFAULT_SALARIES)
+        role_ids = {name: role for role, name in ROLE_NAMES.items()}
+        for role, salary in (salaries or {}).items():
+            if role in role_ids:
+                role = role_ids[role]
+            if role not in ROLE_NAMES:
+                raise ValueError(f"Rol desconocido en el modelo de costes: {role}")
+            self.salaries[role] = salary
+        
+        self.base_revenue = base_revenue
+        self.innovation_weight = innovation_weight
+        self._headcount = None
+        self._payroll = 0
+    
+    def payroll(self, organization):
+        """Devuelve la nómina del período, recalculándola solo si cambia la plantilla."""
+        headcount = (len(organization.managers), len(organization.workers), len(organization.innovators))
+        if headcount != self._headcount:
+            self._headcount = headcount
+            self._payroll = (
+                self.salaries[ROLE_MANAGER] * headcount[0] +
+                self.salaries[ROLE_WORKER] * headcount[1] +
+                self.salaries[ROLE_INNOVATOR] * headcount[2]
+            )
+        return self._payroll
+    
+    def revenue(self, productivity, quality, innovation_impact, market_shock=0.0):
+        """
+        Calcula los ingresos del período.
+        
+        Args:
+            productivity: Fracción de tareas activas completadas
+            quality: Calidad media de las tareas completadas
+            innovation_impact: Impacto total de las innovaciones del período
+            market_shock: Variación relativa del mercado
+        """
+        revenue_factor = productivity * quality * (1 + self.innovation_weight * innovation_impact)
+        return self.base_revenue * revenue_factor * (1 + market_shock)
@@ -0,0 +1,360 @@
+import numpy as np
+
+from backend.core.engine import VectorizedSimulationEngine, TASK_PENDING, TASK_IN_PROGRESS, TASK_COMPLETED
+from backend.core.events import LOG_SUMMARY
+from backend.core.metrics import MetricStore
+from backend.models.allocation import (
+    get_allocation_strategy, check_capacity, skill_based_strategy, random_strategy, balanced_strategy
+)
+
+# Posición libre en los arreglos de tareas del conjunto
+TASK_FREE = -1
+
+class EnsembleSimulationEngine(VectorizedSimulationEngine):
+    """
+    Motor que simula R réplicas independientes de la misma organización a la vez.
+    
+    El estado de los agentes se guarda en arreglos réplica × agente y el de
+    las tareas en arreglos réplica × posición, con posiciones libres que se
+    reutilizan entre períodos. Cada fase hace una sola extracción aleatoria
+    para todas las réplicas, de modo que el coste por réplica es una fracción
+    del de ejecutar las iteraciones una tras otra.
+    
+    Las métricas por réplica y período se guardan en `replica_metrics` (con
+    el formato de results_df, una iteración por réplica) y `metrics` guarda
+    la media entre réplicas, sobre la que se evalúan la convergencia y el
+    resumen de cada período. Las réplicas no modifican los agentes de la
+    organización ni registran el historial de tareas.
+    """
+    
+    def __init__(self, organization, policies, initial_capital=100000, market_volatility=0.3,
+                 replicas=1, **kwargs):
+        if replicas < 1:
+            raise ValueError("El número de réplicas debe ser al menos 1")
+        self.replicas = replicas
+        super().__init__(organization, policies, initial_capital, market_volatility, **kwargs)
+        self.metrics = MetricStore(dtype=np.float64)
+        self.replica_metrics = MetricStore(replicas=replicas)
+        self._reset_period_counters()
+    
+    def _reset_tasks(self, capacity=0):
+        """Inicializa los arreglos de tareas con todas las posiciones libres."""
+        shape = (self.replicas, capacity)
+        self.task_seq = np.zeros(shape, dtype=np.int64)  # Orden de llegada
+        self.task_difficulty = np.ones(shape)
+        self.task_importance = np.zeros(shape)
+        self.task_duration = np.ones(shape, dtype=np.int64)
+        self.task_completion = np.zeros(shape)
+        self.task_assignee = np.full(shape, -1, dtype=np.int64)
+        self.task_status = np.full(shape, TASK_FREE, dtype=np.int8)
+        self.task_quality = np.zeros(shape)
+    
+    def _grow_tasks(self, extra):
+        """Amplía los arreglos de tareas con al menos `extra` posiciones libres por réplica."""
+        capacity = self.task_status.shape[1]
+        previous = {
+            name: getattr(self, name)
+            for name in ("task_seq", "task_difficulty", "task_importance", "task_duration",
+                         "task_completion", "task_assignee", "task_status", "task_quality")
+        }
+        self._reset_tasks(max(capacity + extra, 2 * capacity))
+        for name, values in previous.items():
+            getattr(self, name)[:, :capacity] = values
+    
+    def _reset_period_counters(self):
+        self.replica_generated = np.zeros(self.replicas, dtype=np.int64)
+        self.replica_completed = np.zeros(self.replicas, dtype=np.int64)
+        self.replica_quality = np.zeros(self.replicas)
+    
+    def _set_metric(self, name, values):
+        # Valor por réplica y media entre réplicas
+        self.replica_metrics.set(name, values)
+        self.metrics.set(name, float(np.mean(values)))
+    
+    def load_agents(self):
+        """Copia el estado de los agentes a arreglos réplica × agente."""
+        super().load_agents()
+        self.knowledge = np.tile(self.knowledge, (self.replicas, 1))
+        self.satisfaction = np.tile(self.satisfaction, (self.replicas, 1))
+        self.innovations = np.zeros((self.replicas, len(self.innovator_idx)), dtype=np.int64)
+    
+    def sync_agents(self):
+        """Las réplicas no escriben su estado en los agentes de la organización."""
+    
+    def start_run(self):
+        """Carga los agentes solo la primera vez; las réplicas conservan su estado entre ejecuciones."""
+        if not self.agents_loaded:
+            self.load_agents()
+    
+    def trim_history(self, start):
+        """Conserva solo la fila del último período, también por réplica."""
+        self.metrics.trim(start)
+        self.replica_metrics.trim(start)
+    
+    def generate_tasks(self, num_tasks=None):
+        """Genera las tareas del período de todas las réplicas en un solo bloque."""
+        if num_tasks is None:
+            counts = self.arrivals.sample(self.rng, max(5, len(self.agents) // 2), size=self.replicas)
+        else:
+            counts = np.full(self.replicas, num_tasks, dtype=np.int64)
+        total = int(counts.sum())
+        
+        free = self.task_status == TASK_FREE
+        shortage = int((counts - free.sum(axis=1)).max())
+        if shortage > 0:
+            self._grow_tasks(shortage)
+            free = self.task_status == TASK_FREE
+        
+        # Las primeras posiciones libres de cada réplica reciben sus nuevas tareas
+        new = free & (np.cumsum(free, axis=1) <= counts[:, None])
+        self.task_seq[new] = np.arange(self.next_task_id, self.next_task_id + total)
+        self.task_difficulty[new] = self.rng.uniform(0.3, 0.9, total)
+        self.task_importance[new] = self.rng.uniform(0.2, 1.0, total)
+        self.task_duration[new] = self.rng.integers(1, 4, total)
+        self.task_completion[new] = 0.0
+        self.task_assignee[new] = -1
+        self.task_status[new] = TASK_PENDING
+        self.task_quality[new] = 0.0
+        
+        self.next_task_id += total
+        self.period_generated += total
+        self.replica_generated += counts
+        self.events.record(LOG_SUMMARY, self.current_period, "tasks_generated", values=(total,))
+    
+    def _assign_pending(self, pending, num_pending):
+        """
+        Calcula asignaciones para las tareas pendientes de todas las réplicas.
+        
+        Args:
+            pending: Máscara réplica × posición de tareas pendientes
+            num_pending: Número de tareas pendientes por réplica
+        
+        Returns:
+            tuple: (réplicas, posiciones de tareas, índices de agentes) de cada asignación
+        """
+        workers = self.worker_idx
+        num_workers = len(workers)
+        strategy = get_allocation_strategy(self.policies.task_allocation)
+        knowledge = self.knowledge[:, workers]
+        
+        if strategy is skill_based_strategy:
+            # Tareas por importancia, dificultad y llegada hasta la capacidad de los workers
+            capacity = self.policies.task_capacity
+            check_capacity(capacity)
+            slots = capacity * num_workers
+            priority = np.lexsort((self.task_seq, np.where(pending, -self.task_difficulty, np.inf),
+                                   np.where(pending, -self.task_importance, np.inf)), axis=-1)
+            selected = priority[:, :slots]
+            valid = np.arange(selected.shape[1]) < np.minimum(num_pending, slots)[:, None]
+            
+            # Tarea más difícil al agente más calificado, en cada réplica
+            difficulty = np.take_along_axis(self.task_difficulty, selected, axis=1)
+            order = np.argsort(np.where(valid, -difficulty, np.inf), axis=1, kind="stable")
+            selected = np.take_along_axis(selected, order, axis=1)
+            agent_order = np.argsort(-knowledge, axis=1, kind="stable")
+            agent_slots = np.repeat(agent_order, capacity, axis=1)[:, :selected.shape[1]]
+            rows = np.nonzero(valid)[0]
+            return rows, selected[valid], workers[agent_slots[valid]]
+        
+        if strategy is not random_strategy and strategy is not balanced_strategy:
+            return self._assign_by_replica(strategy, pending, num_pending)
+        
+        # Random y Balanced recorren las tareas pendientes en orden de llegada
+        order = np.argsort(np.where(pending, self.task_seq, np.iinfo(np.int64).max), axis=1, kind="stable")
+        order = order[:, :int(num_pending.max())]
+        ranks = np.arange(order.shape[1])
+        valid = ranks < num_pending[:, None]
+        rows = np.nonzero(valid)[0]
+        positions = order[valid]
+        
+        if strategy is random_strategy:
+            chosen = self.rng.integers(0, num_workers, len(positions))
+        
+        else:
+            # Balanced: 80% habilidad, 20% disponibilidad; las réplicas avanzan a la vez
+            workload = np.zeros((self.replicas, num_workers))
+            chosen_matrix = np.zeros(order.shape, dtype=np.int64)
+            for k in range(order.shape[1]):
+                active = np.flatnonzero(num_pending > k)
+                task_difficulty = self.task_difficulty[active, order[active, k]]
+                scores = 0.8 * (knowledge[active] / task_difficulty[:, None]) + 0.2 * (1.0 / (workload[active] + 1))
+                best = np.argmax(scores, axis=1)
+                chosen_matrix[active, k] = best
+                workload[active, best] += 1
+            chosen = chosen_matrix[valid]
+        
+        return rows, positions, workers[chosen]
+    
+    def _assign_by_replica(self, strategy, pending, num_pending):
+        """
+        Aplica una estrategia registrada a cada réplica por separado.
+        
+        Se usa para las estrategias sin versión por lotes entre réplicas
+        (Availability-based, Optimal y las registradas por el usuario).
+        """
+        workers = self.worker_idx
+        loads = self.worker_loads()
+        rows, positions, chosen = [], [], []
+        
+        for replica in np.flatnonzero(num_pending):
+            # Tareas pendientes de la réplica en orden de llegada
+            task_pos = np.flatnonzero(pending[replica])
+            task_pos = task_pos[np.argsort(self.task_seq[replica, task_pos], kind="stable")]
+            agent_pos = np.asarray(strategy(
+                {"difficulty": self.task_difficulty[replica, task_pos],
+                 "importance": self.task_importance[replica, task_pos]},
+                {"knowledge": self.knowledge[replica, workers], "productivity": self.productivity[workers]},
+                loads[replica],
+                self.policies.task_capacity,
+                self.rng
+            ))
+            assigned = agent_pos >= 0
+            rows.append(np.full(int(assigned.sum()), replica))
+            positions.append(task_pos[assigned])
+            chosen.append(agent_pos[assigned])
+        
+        return np.concatenate(rows), np.concatenate(positions), workers[np.concatenate(chosen)]
+    
+    def worker_loads(self):
+        """Número de tareas en progreso de cada worker, por réplica."""
+        rows, positions = np.nonzero(self.task_status == TASK_IN_PROGRESS)
+        loads = np.zeros((self.replicas, len(self.agents)), dtype=np.int64)
+        np.add.at(loads, (rows, self.task_assignee[rows, positions]), 1)
+        return loads[:, self.worker_idx]
+    
+    def allocate_tasks(self):
+        """Asigna las tareas pendientes de todas las réplicas."""
+        pending = self.task_status == TASK_PENDING
+        num_pending = pending.sum(axis=1)
+        
+        if not num_pending.any() or len(self.worker_idx) == 0:
+            return
+        
+        rows, positions, agents = self._assign_pending(pending, num_pending)
+        self.task_assignee[rows, positions] = agents
+        self.task_status[rows, positions] = TASK_IN_PROGRESS
+        self.events.record(LOG_SUMMARY, self.current_period, "tasks_assigned", values=(len(rows),))
+    
+    def process_tasks(self):
+        """Procesa las tareas en progreso de todas las réplicas."""
+        rows, positions = np.nonzero(self.task_status == TASK_IN_PROGRESS)
+        
+        if len(rows) == 0:
+            return
+        
+        agents = self.task_assignee[rows, positions]
+        difficulty = self.task_difficulty[rows, positions]
+        
+        # Progreso: Worker.produce / duración
+        output = np.minimum(1.0, self.productivity[agents] * self.knowledge[rows, agents] / difficulty)
+        progress = output / self.task_duration[rows, positions]
+        completion = self.task_completion[rows, positions] + progress
+        self.task_completion[rows, positions] = completion
+        
+        done = completion >= 1.0
+        if not done.any():
+            return
+        
+        done_rows = rows[done]
+        done_pos = positions[done]
+        done_agents = agents[done]
+        quality = self.knowledge[done_rows, done_agents] * self.rng.uniform(0.8, 1.0, len(done_rows))
+        self.task_status[done_rows, done_pos] = TASK_COMPLETED
+        self.task_completion[done_rows, done_pos] = 1.0
+        self.task_quality[done_rows, done_pos] = quality
+        
+        self.period_completed += len(done_rows)
+        self.replica_completed += np.bincount(done_rows, minlength=self.replicas)
+        self.replica_quality += np.bincount(done_rows, weights=quality, minlength=self.replicas)
+        
+        # Aprendizaje: Worker.learn_from_task acumulado por réplica y agente
+        gains = np.zeros_like(self.knowledge)
+        np.add.at(gains, (done_rows, done_agents), self.learning_rate[done_agents] * difficulty[done] * 0.1)
+        self.knowledge = np.minimum(1.0, self.knowledge + gains)
+        
+        self.events.record(LOG_SUMMARY, self.current_period, "tasks_completed", values=(len(done_rows),))
+    
+    def process_innovations(self):
+        """Procesa los intentos de innovación de todas las réplicas."""
+        budget = self.organization.allocate_budget(
+            self.policies.training_budget / 100,
+            self.policies.innovation_budget / 100
+        )
+        
+        innovation_resources = budget["innovation"]
+        num_innovators = len(self.innovator_idx)
+        
+        if num_innovators == 0 or innovation_resources <= 0:
+            return
+        
+        resources = innovation_resources / num_innovators / 10000  # Normalizar
+        knowledge = self.knowledge[:, self.innovator_idx]
+        
+        success = self.discovery_probability * resources * knowledge > 0.5
+        impact = np.where(success, self.impact_factor * knowledge * resources, 0.0)
+        self.innovations += success
+        
+        self._set_metric("innovation_rate", success.sum(axis=1) / num_innovators)
+        self._set_metric("innovation_impact", impact.sum(axis=1))
+    
+    def update_agent_satisfaction(self):
+        """Actualiza la satisfacción de los agentes de todas las réplicas."""
+        org_support = self.organizational_support()
+        self.satisfaction = 0.3 * self.satisfaction + 0.5 * self.avg_performance + 0.2 * org_support
+        
+        if self.satisfaction.shape[1]:
+            self._set_metric("agent_satisfaction", self.satisfaction.mean(axis=1))
+    
+    def active_task_count(self):
+        """Número de tareas activas por réplica (incluidas las completadas en el período)."""
+        return (self.task_status != TASK_FREE).sum(axis=1)
+    
+    def update_financial_metrics(self):
+        """Actualiza métricas financieras y de productividad de todas las réplicas."""
+        completed = self.replica_completed
+        productivity = completed / np.maximum(1, self.active_task_count())
+        quality = self.replica_quality / np.maximum(1, completed)
+        
+        total_cost = self.cost_model.payroll(self.organization)
+        market_shock = self.rng.uniform(-self.market_volatility, self.market_volatility, self.replicas)
+        innovation_impact = self.replica_metrics.get("innovation_impact")
+        revenue = self.cost_model.revenue(productivity, quality, innovation_impact, market_shock)
+        
+        self._set_metric("productivity", productivity)
+        self._set_metric("quality", quality)
+        self._set_metric("revenue", revenue)
+        self._set_metric("costs", np.full(self.replicas, float(total_cost)))
+        self._set_metric("profit", revenue - total_cost)
+        self._set_metric("cost_efficiency", revenue / max(1, total_cost))
+    
+    def clean_completed_tasks(self):
+        """Libera las posiciones de las tareas completadas."""
+        self.task_status[self.task_status == TASK_COMPLETED] = TASK_FREE
+    
+    def run_period(self):
+        """Ejecuta un período en todas las réplicas."""
+        if not self.agents_loaded:
+            self.load_agents()
+        self._reset_period_counters()
+        self.replica_metrics.new_row(self.current_period + 1)
+        return super().run_period()
+    
+    def period_summary(self):
+        """Construye el resumen del período actual (media entre réplicas)."""
+        self._set_metric("tasks_completed", self.replica_completed)
+        self._set_metric("tasks_generated", self.replica_generated)
+        return self.metrics.row()
+    
+    def run_simulation(self, num_periods, convergence=None):
+        """
+        Ejecuta la simulación en todas las réplicas.
+        
+        Además de las claves habituales (con la media entre réplicas en
+        "results"), devuelve "replica_results": un DataFrame con una fila por
+        réplica y período y la columna `iteration`, como results_df.
+        """
+        first_row = len(self.replica_metrics)
+        self.replica_metrics.reserve(num_periods)
+        result = super().run_simulation(num_periods, convergence)
+        result["replica_results"] = self.replica_metrics.to_frame(first_row)
+        return result
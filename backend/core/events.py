@@ -0,0 +1,135 @@
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Niveles de detalle del registro de eventos
+LOG_OFF = 0
+LOG_SUMMARY = 1
+LOG_TASK = 2
+
+LOG_LEVELS = {
+    "off": LOG_OFF,
+    "summary": LOG_SUMMARY,
+    "task": LOG_TASK
+}
+
+# Plantillas de texto por código de evento (ids y valores como argumentos posicionales)
+EVENT_TEMPLATES = {
+    "message": "{0}",
+    "simulation_start": "Iniciando simulación de {0} períodos",
+    "simulation_end": "Simulación completada en {0:.2f} segundos",
+    "simulation_converged": "Convergencia alcanzada en el período {0}",
+    "period_start": "Iniciando período {0}",
+    "period_end": "Finalizado período {0}",
+    "task_generated": "Generada tarea {0} con dificultad {1:.2f}",
+    "task_assigned": "Tarea {0} asignada al agente {1}",
+    "task_completed": "Tarea {0} completada por agente {1}",
+    "innovation": "Innovación lograda por {0} con impacto {1:.2f}",
+    "tasks_generated": "Generadas {0} tareas",
+    "tasks_assigned": "Asignadas {0} tareas",
+    "tasks_completed": "Completadas {0} tareas"
+}
+
+def parse_log_level(level):
+    """Convierte un nivel de detalle ("off", "summary", "task") a su valor entero."""
+    if isinstance(level, int):
+        return level
+    if level not in LOG_LEVELS:
+        raise ValueError(f"Nivel de registro desconocido: {level}")
+    return LOG_LEVELS[level]
+
+def render_event(event):
+    """Convierte una tupla (period, code, ids, values) en una línea de texto."""
+    period, code, ids, values = event
+    text = EVENT_TEMPLATES.get(code, code).format(*ids, *values)
+    return f"[Período {period}] {text}"
+
+class EventRecorder:
+    """
+    Registro estructurado de eventos con búfer circular acotado.
+    
+    Los eventos se guardan como tuplas (period, event_code, ids, values) y solo
+    se convierten a texto cuando se leen. Los eventos por encima del nivel de
+    detalle configurado se descartan sin formatear.
+    """
+    
+    def __init__(self, level="summary", capacity=10000):
+        self.level = parse_log_level(level)
+        self.events = deque(maxlen=capacity)
+    
+    def set_level(self, level):
+        """Cambia el nivel de detalle del registro."""
+        self.level = parse_log_level(level)
+    
+    def enabled(self, level):
+        """Indica si se registran eventos del nivel indicado."""
+        return level <= self.level
+    
+    def record(self, level, period, code, ids=(), values=()):
+        """Registra un evento si el nivel está habilitado."""
+        if level > self.level:
+            return
+        event = (period, code, ids, values)
+        self.events.append(event)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(render_event(event))
+    
+    def clear(self):
+        """Elimina todos los eventos registrados."""
+        self.events.clear()
+    
+    def render(self):
+        """Devuelve todos los eventos como líneas de texto."""
+        return [render_event(event) for event in self.events]
+    
+    def __len__(self):
+        return len(self.events)
+    
+    def __iter__(self):
+        return (render_event(event) for event in self.events)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [render_event(event) for event in list(self.events)[index]]
+        return render_event(self.events[index])
+
+class LogView:
+    """
+    Vista de solo lectura sobre varios registros de eventos.
+    
+    Concatena los eventos de varias fuentes (por ejemplo, una por iteración)
+    añadiendo un prefijo a cada línea, que se formatea solo al acceder a ella.
+    Guarda una copia de los eventos de cada fuente al añadirla, así que no
+    cambia aunque el registro original siga usándose en otra ejecución.
+    """
+    
+    def __init__(self, sources=None):
+        self.sources = []  # Lista de (prefijo, tupla de eventos)
+        for prefix, source in sources or []:
+            self.add(prefix, source)
+    
+    def add(self, prefix, source):
+        """Añade una copia de los eventos de un EventRecorder u otra LogView con su prefijo."""
+        if isinstance(source, LogView):
+            self.sources.extend((prefix + inner, events) for inner, events in source.sources)
+        else:
+            self.sources.append((prefix, tuple(source.events)))
+    
+    def _entries(self):
+        for prefix, events in self.sources:
+            for event in events:
+                yield prefix, event
+    
+    def __len__(self):
+        return sum(len(events) for _, events in self.sources)
+    
+    def __iter__(self):
+        return (f"{prefix}{render_event(event)}" for prefix, event in self._entries())
+    
+    def __getitem__(self, index):
+        entries = list(self._entries())
+        if isinstance(index, slice):
+            return [f"{prefix}{render_event(event)}" for prefix, event in entries[index]]
+        prefix, event = entries[index]
+        return f"{prefix}{render_event(event)}"
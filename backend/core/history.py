@@ -0,0 +1,270 @@
+import os
+import uuid
+import contextlib
+import shutil
+import tempfile
+import weakref
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# Columnas del historial de tareas y su tipo (None: se infiere de los datos)
+HISTORY_COLUMNS = {
+    "task_id": np.int64,
+    "period": np.int32,
+    "difficulty": np.float64,
+    "importance": np.float64,
+    "duration": np.int16,
+    "assigned_to": None,
+    "quality": np.float64,
+    "time_efficiency": np.float64
+}
+
+# Directorios de volcado vivos en este proceso, por ruta
+_live_directories = weakref.WeakValueDictionary()
+
+# Serializaciones en curso que deben incluir el contenido de los segmentos
+_embedding = 0
+
+@contextlib.contextmanager
+def embedded_segments():
+    """
+    Hace que los historiales serializados dentro del bloque incluyan sus segmentos.
+    
+    Los checkpoints en bytes o en archivo deben poder restaurarse en otro
+    proceso, donde el directorio temporal de volcado ya no existe; las
+    copias en memoria (clone, fork) siguen compartiendo los segmentos.
+    """
+    global _embedding
+    _embedding += 1
+    try:
+        yield
+    finally:
+        _embedding -= 1
+
+class SpillDirectory:
+    """
+    Directorio donde se vuelcan los segmentos del historial.
+    
+    Si es temporal, se elimina cuando ningún historial lo referencia. Al
+    copiarse con pickle dentro del mismo proceso (por ejemplo, al bifurcar un
+    motor) se reutiliza la misma instancia, de modo que los historiales
+    bifurcados comparten los segmentos ya escritos sin copiarlos.
+    """
+    
+    def __init__(self, path=None):
+        self.temporary = path is None
+        self.path = path if path is not None else tempfile.mkdtemp(prefix="agentflow_history_")
+        os.makedirs(self.path, exist_ok=True)
+        if self.temporary:
+            weakref.finalize(self, shutil.rmtree, self.path, True)
+        _live_directories[self.path] = self
+    
+    @classmethod
+    def attach(cls, path):
+        """Devuelve la instancia viva para la ruta o un acceso sin propiedad del directorio."""
+        directory = _live_directories.get(path)
+        if directory is None:
+            if not os.path.isdir(path):
+                raise FileNotFoundError(f"El directorio de volcado del historial no existe: {path}")
+            directory = cls(path)
+        return directory
+    
+    def __reduce__(self):
+        return (SpillDirectory.attach, (self.path,))
+    
+    def new_segment_path(self):
+        """Devuelve una ruta única para un nuevo segmento."""
+        return os.path.join(self.path, f"segment_{uuid.uuid4().hex}.npz")
+
+class TaskHistoryStore:
+    """
+    Historial columnar de tareas completadas.
+    
+    Las tareas se guardan como registros compactos por columnas. Solo se
+    mantiene en memoria una ventana configurable de registros; los bloques
+    más antiguos se vuelcan a disco como segmentos .npz que se leen de forma
+    perezosa al recorrer el historial.
+    
+    Los bloques consolidados en memoria nunca suman más de `window`
+    registros; además quedan menos de `chunk_size` registros pendientes de
+    consolidar, y `chunk_size` se limita a `window`.
+    """
+    
+    def __init__(self, window=10000, spill_dir=None, chunk_size=1024):
+        """
+        Args:
+            window: Número máximo de registros consolidados en memoria (None: sin límite)
+            spill_dir: Directorio para los segmentos en disco (por defecto uno temporal)
+            chunk_size: Registros por bloque columnar (como mucho `window`)
+        """
+        self.window = window
+        self.spill_dir = spill_dir
+        self.chunk_size = chunk_size if window is None else max(1, min(chunk_size, window))
+        self.segments = []  # Rutas de los segmentos volcados a disco
+        self.chunks = deque()  # Bloques columnares en memoria
+        self.total = 0
+        self._buffer = {name: [] for name in HISTORY_COLUMNS}
+        self._pending = []  # Bloques pequeños aún no consolidados
+        self._buffered = 0
+        self._in_memory = 0
+        self._directory = None
+    
+    def __len__(self):
+        return self.total
+    
+    def append(self, task, period):
+        """Añade una tarea completada al historial."""
+        buffer = self._buffer
+        buffer["task_id"].append(task.task_id)
+        buffer["period"].append(period)
+        buffer["difficulty"].append(task.difficulty)
+        buffer["importance"].append(task.importance)
+        buffer["duration"].append(task.duration)
+        buffer["assigned_to"].append(task.assigned_to)
+        buffer["quality"].append(task.quality)
+        buffer["time_efficiency"].append(task.time_efficiency)
+        
+        self._buffered += 1
+        self.total += 1
+        
+        if self._buffered >= self.chunk_size:
+            self.flush()
+    
+    def append_columns(self, **columns):
+        """Añade un bloque de tareas completadas dado como arreglos por columna."""
+        size = len(columns["task_id"])
+        if size == 0:
+            return
+        
+        self._pack_buffer()
+        self._pending.append({
+            name: np.asarray(columns[name], dtype=dtype)
+            for name, dtype in HISTORY_COLUMNS.items()
+        })
+        self._buffered += size
+        self.total += size
+        
+        if self._buffered >= self.chunk_size:
+            self.flush()
+    
+    def _pack_buffer(self):
+        # Convertir los registros añadidos uno a uno en un bloque de arreglos
+        if not self._buffer["task_id"]:
+            return
+        self._pending.append({
+            name: np.asarray(values, dtype=HISTORY_COLUMNS[name])
+            for name, values in self._buffer.items()
+        })
+        self._buffer = {name: [] for name in HISTORY_COLUMNS}
+    
+    def flush(self):
+        """Consolida los registros pendientes en un único bloque columnar."""
+        if self._buffered == 0:
+            return
+        
+        self._pack_buffer()
+        pending = self._pending
+        if len(pending) == 1:
+            chunk = pending[0]
+        else:
+            chunk = {name: np.concatenate([part[name] for part in pending]) for name in HISTORY_COLUMNS}
+        self._pending = []
+        self._buffered = 0
+        
+        size = len(chunk["task_id"])
+        if size <= self.chunk_size:
+            self._add_chunk(chunk)
+            return
+        
+        # Partir los bloques grandes (p. ej. un período entero del motor
+        # vectorizado) para que la ventana pueda volcarlos por partes
+        for start in range(0, size, self.chunk_size):
+            self._add_chunk({name: values[start:start + self.chunk_size].copy() for name, values in chunk.items()})
+    
+    def _add_chunk(self, chunk):
+        self.chunks.append(chunk)
+        self._in_memory += len(chunk["task_id"])
+        
+        # Volcar a disco los bloques más antiguos que exceden la ventana
+        while self.window is not None and self._in_memory > self.window and len(self.chunks) > 1:
+            self._spill(self.chunks.popleft())
+    
+    def _spill(self, chunk):
+        self._write_segment(chunk)
+        self._in_memory -= len(chunk["task_id"])
+    
+    def _write_segment(self, chunk):
+        if self._directory is None:
+            self._directory = SpillDirectory(self.spill_dir)
+            self.spill_dir = self._directory.path
+        
+        path = self._directory.new_segment_path()
+        np.savez(path, **chunk)
+        self.segments.append(path)
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if _embedding:
+            # Checkpoint autónomo: guardar el contenido de los segmentos en lugar de sus rutas
+            segments = []
+            for path in self.segments:
+                with np.load(path) as segment:
+                    segments.append({name: segment[name] for name in HISTORY_COLUMNS})
+            state["segments"] = segments
+            state["_directory"] = None
+            if self._directory is not None and self._directory.temporary:
+                state["spill_dir"] = None
+        return state
+    
+    def __setstate__(self, state):
+        segments = state["segments"]
+        self.__dict__.update(state)
+        if segments and isinstance(segments[0], dict):
+            # Volver a volcar los segmentos incluidos en un directorio propio
+            self.segments = []
+            for chunk in segments:
+                self._write_segment(chunk)
+    
+    def iter_chunks(self, columns=None):
+        """
+        Recorre el historial bloque a bloque, del más antiguo al más reciente.
+        
+        Args:
+            columns: Columnas a leer (por defecto todas)
+        
+        Yields:
+            dict: Arreglos por columna de cada bloque
+        """
+        columns = list(columns or HISTORY_COLUMNS)
+        self.flush()
+        
+        for path in self.segments:
+            with np.load(path) as segment:
+                yield {name: segment[name] for name in columns}
+        
+        for chunk in self.chunks:
+            yield {name: chunk[name] for name in columns}
+    
+    def column(self, name):
+        """Devuelve una columna completa del historial."""
+        parts = [chunk[name] for chunk in self.iter_chunks([name])]
+        if not parts:
+            return np.empty(0, dtype=HISTORY_COLUMNS[name])
+        return np.concatenate(parts)
+    
+    def to_frame(self, columns=None):
+        """Devuelve el historial completo como DataFrame."""
+        columns = list(columns or HISTORY_COLUMNS)
+        return pd.DataFrame({name: self.column(name) for name in columns})
+    
+    def recent(self):
+        """Devuelve como DataFrame solo los registros que están en memoria."""
+        self.flush()
+        if not self.chunks:
+            return pd.DataFrame(columns=list(HISTORY_COLUMNS))
+        return pd.DataFrame({
+            name: np.concatenate([chunk[name] for chunk in self.chunks])
+            for name in HISTORY_COLUMNS
+        })
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+# Columnas de métricas por período y su tipo
+METRIC_COLUMNS = {
+    "period": np.int64,
+    "productivity": np.float64,
+    "cost_efficiency": np.float64,
+    "innovation_rate": np.float64,
+    "agent_satisfaction": np.float64,
+    "tasks_completed": np.int64,
+    "tasks_generated": np.int64,
+    "quality": np.float64,
+    "revenue": np.float64,
+    "costs": np.float64,
+    "profit": np.float64,
+    "innovation_impact": np.float64
+}
+
+# Columnas del resumen devuelto por período
+SUMMARY_COLUMNS = (
+    "period", "productivity", "cost_efficiency", "innovation_rate",
+    "agent_satisfaction", "tasks_completed", "tasks_generated"
+)
+
+class MetricStore:
+    """
+    Métricas de la simulación en arreglos NumPy preasignados.
+    
+    Cada período ocupa una fila; cada métrica es un arreglo tipado de
+    capacidad fija que solo se amplía (duplicándose) si se ejecutan más
+    períodos de los reservados. Las métricas que un período no calcula
+    quedan a 0 en su fila, de modo que todas las columnas están alineadas.
+    
+    Con `replicas` cada fila guarda un valor por réplica (arreglos de forma
+    períodos × réplicas), como en el motor de conjunto.
+    """
+    
+    def __init__(self, capacity=0, replicas=None, dtype=None):
+        """
+        Args:
+            capacity: Filas reservadas inicialmente
+            replicas: Número de réplicas por fila (None: un valor por fila)
+            dtype: Tipo común para todas las métricas salvo el período (por defecto, el de METRIC_COLUMNS)
+        """
+        self.size = 0
+        self.replicas = replicas
+        shape = (capacity,) if replicas is None else (capacity, replicas)
+        self.columns = {
+            name: np.zeros(shape, dtype=column_dtype if dtype is None or name == "period" else dtype)
+            for name, column_dtype in METRIC_COLUMNS.items()
+        }
+    
+    def __len__(self):
+        return self.size
+    
+    def __contains__(self, name):
+        return name in self.columns
+    
+    def __getitem__(self, name):
+        """Devuelve una vista de la columna con las filas ocupadas."""
+        return self.columns[name][:self.size]
+    
+    def keys(self):
+        return self.columns.keys()
+    
+    @property
+    def capacity(self):
+        return len(self.columns["period"])
+    
+    def reserve(self, rows):
+        """Garantiza espacio para `rows` filas adicionales sin reasignar."""
+        required = self.size + rows
+        if required <= self.capacity:
+            return
+        
+        for name, values in self.columns.items():
+            grown = np.zeros((required,) + values.shape[1:], dtype=values.dtype)
+            grown[:self.size] = values[:self.size]
+            self.columns[name] = grown
+    
+    def new_row(self, period):
+        """Abre la fila de un nuevo período con todas las métricas a 0."""
+        if self.size == self.capacity:
+            self.reserve(max(16, self.capacity))
+        
+        row = self.size
+        for values in self.columns.values():
+            values[row] = 0
+        self.columns["period"][row] = period
+        self.size += 1
+    
+    def trim(self, start=0, keep=1):
+        """
+        Descarta filas antiguas conservando solo las `keep` más recientes.
+        
+        Las filas anteriores a `start` no se modifican, de modo que los
+        resultados ya devueltos como vistas siguen siendo válidos.
+        """
+        if self.size - start <= keep:
+            return
+        for values in self.columns.values():
+            values[start:start + keep] = values[self.size - keep:self.size]
+        self.size = start + keep
+    
+    def set(self, name, value):
+        """Asigna el valor de una métrica en la fila del período actual."""
+        self.columns[name][self.size - 1] = value
+    
+    def get(self, name, default=0):
+        """Devuelve el valor de una métrica en la fila del período actual."""
+        if self.size == 0:
+            return default
+        value = self.columns[name][self.size - 1]
+        return value.item() if self.replicas is None else value.copy()
+    
+    def row(self, columns=SUMMARY_COLUMNS):
+        """Devuelve la fila del período actual como diccionario."""
+        return {name: self.get(name) for name in columns}
+    
+    def as_dict(self, start=0):
+        """Devuelve vistas de todas las columnas a partir de la fila `start`."""
+        return {name: values[start:self.size] for name, values in self.columns.items()}
+    
+    def to_frame(self, start=0):
+        """
+        Devuelve las métricas como DataFrame sin copiar los arreglos.
+        
+        Con réplicas, el DataFrame tiene una fila por réplica y período,
+        ordenadas por réplica, y una columna `iteration` (réplica + 1) como
+        la que produce Simulator.run.
+        """
+        if self.replicas is None:
+            return pd.DataFrame(self.as_dict(start), copy=False)
+        
+        periods = self.size - start
+        frame = {name: values[start:self.size].T.ravel() for name, values in self.columns.items()}
+        frame["iteration"] = np.repeat(np.arange(1, self.replicas + 1), periods)
+        return pd.DataFrame(frame, copy=False)
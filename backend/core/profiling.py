@@ -0,0 +1,93 @@
+import time
+from collections import defaultdict
+
+# Fases de un período de simulación, en orden de ejecución
+PHASES = ("generate", "allocate", "process", "innovate", "satisfaction", "financials", "cleanup")
+
+class PhaseProfiler:
+    """
+    Medición del tiempo de cada fase de run_period.
+    
+    Acumula el tiempo de reloj y el número de llamadas por fase y,
+    opcionalmente, guarda una muestra por período. Admite funciones de
+    enganche que se ejecutan antes y después de cada fase:
+    
+    - before(engine, phase)
+    - after(engine, phase, elapsed)
+    """
+    
+    def __init__(self, record_periods=False):
+        """
+        Args:
+            record_periods: Guardar también los tiempos de cada período
+        """
+        self.record_periods = record_periods
+        self.before_hooks = []
+        self.after_hooks = []
+        self.reset()
+    
+    def reset(self):
+        """Descarta los tiempos acumulados."""
+        self.totals = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.samples = []
+        self._period = {}
+    
+    def add_hook(self, before=None, after=None):
+        """Registra funciones a ejecutar antes y/o después de cada fase."""
+        if before is not None:
+            self.before_hooks.append(before)
+        if after is not None:
+            self.after_hooks.append(after)
+    
+    def run(self, engine, phase, func, *args):
+        """Ejecuta una fase midiendo su duración y devuelve su resultado."""
+        for hook in self.before_hooks:
+            hook(engine, phase)
+        
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        
+        self.totals[phase] += elapsed
+        self.calls[phase] += 1
+        if self.record_periods:
+            self._period[phase] = self._period.get(phase, 0.0) + elapsed
+        
+        for hook in self.after_hooks:
+            hook(engine, phase, elapsed)
+        return result
+    
+    def end_period(self, period):
+        """Cierra la muestra del período actual."""
+        if self.record_periods:
+            self.samples.append(dict(self._period, period=period))
+            self._period = {}
+    
+    def summary(self):
+        """
+        Resume los tiempos medidos.
+        
+        Returns:
+            dict: Tiempo total, llamadas y tiempo medio por fase, y muestras por período
+        """
+        phases = {
+            phase: {
+                "total_seconds": self.totals[phase],
+                "calls": self.calls[phase],
+                "mean_seconds": self.totals[phase] / self.calls[phase]
+            }
+            for phase in PHASES if phase in self.calls
+        }
+        return {
+            "phases": phases,
+            "total_seconds": sum(self.totals.values()),
+            "periods": list(self.samples) if self.record_periods else None
+        }
+    
+    def __getstate__(self):
+        # Los enganches (funciones arbitrarias) no se copian en checkpoints
+        state = self.__dict__.copy()
+        state["before_hooks"] = []
+        state["after_hooks"] = []
+        return state
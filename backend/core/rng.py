@@ -0,0 +1,47 @@
+import numpy as np
+
+def make_seed_sequence(seed=None):
+    """
+    Crea una SeedSequence a partir de una semilla.
+    
+    Args:
+        seed: Entero, SeedSequence existente o None (entropía del sistema)
+    
+    Returns:
+        np.random.SeedSequence
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
+def make_rng(seed=None):
+    """
+    Crea un generador aleatorio independiente.
+    
+    Args:
+        seed: Entero, SeedSequence, Generator existente o None
+    
+    Returns:
+        np.random.Generator
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(make_seed_sequence(seed))
+
+def spawn_seeds(seed_sequence, count):
+    """Deriva secuencias hijas independientes de una SeedSequence."""
+    return make_seed_sequence(seed_sequence).spawn(count)
+
+def child_seed(seed_sequence, key):
+    """
+    Deriva una secuencia hija identificada por una clave entera.
+    
+    A diferencia de spawn, el resultado no depende del orden de las llamadas,
+    por lo que trials o workers paralelos obtienen siempre el mismo flujo.
+    """
+    seed_sequence = make_seed_sequence(seed_sequence)
+    return np.random.SeedSequence(
+        seed_sequence.entropy,
+        spawn_key=tuple(seed_sequence.spawn_key) + (key,),
+        pool_size=seed_sequence.pool_size
+    )
@@ -1,22 +1,94 @@
 import time
-import random
+
+# Etiquetas enteras de rol para distinguir tipos de agente sin comparar nombres de clase
+ROLE_MANAGER = 0
+ROLE_WORKER = 1
+ROLE_INNOVATOR = 2
+
+ROLE_NAMES = {
+    ROLE_MANAGER: "Manager",
+    ROLE_WORKER: "Worker",
+    ROLE_INNOVATOR: "Innovator"
+}
+
+# Número de tareas recientes que determinan el desempeño medio
+PERFORMANCE_WINDOW = 5
+
+class PerformanceBuffer:
+    """
+    Búfer circular con los últimos desempeños de un agente.
+    
+    Mantiene la suma de la ventana, de modo que la media reciente se obtiene
+    en O(1) y sin crear listas. La trayectoria completa solo se guarda si
+    se activa su registro.
+    """
+    
+    __slots__ = ("values", "count", "position", "total", "trajectory")
+    
+    def __init__(self, size=PERFORMANCE_WINDOW, record=False):
+        self.values = [0.0] * size
+        self.count = 0
+        self.position = 0
+        self.total = 0.0
+        self.trajectory = [] if record else None
+    
+    def __len__(self):
+        return self.count
+    
+    def __iter__(self):
+        return iter(self.recent())
+    
+    def append(self, value):
+        """Añade un desempeño, descartando el más antiguo si la ventana está llena."""
+        values = self.values
+        size = len(values)
+        if self.count == size:
+            self.total -= values[self.position]
+        else:
+            self.count += 1
+        
+        values[self.position] = value
+        self.total += value
+        self.position = (self.position + 1) % size
+        
+        # Recalcular la suma en cada vuelta para no acumular error de redondeo
+        if self.position == 0:
+            self.total = sum(values)
+        
+        if self.trajectory is not None:
+            self.trajectory.append(value)
+    
+    def mean(self):
+        """Media de los desempeños de la ventana (0 si no hay ninguno)."""
+        return self.total / self.count if self.count else 0.0
+    
+    def recent(self):
+        """Desempeños de la ventana, del más antiguo al más reciente."""
+        values = self.values
+        if self.count < len(values):
+            return values[:self.count]
+        return values[self.position:] + values[:self.position]
 
 class Agent:
     """Clase base para todos los tipos de agentes."""
     
+    __slots__ = ("agent_id", "knowledge_level", "satisfaction", "tasks_completed", "performance_history")
+    role = None
+    
     def __init__(self, agent_id, knowledge_level=0.5):
         self.agent_id = agent_id
         self.knowledge_level = knowledge_level
         self.satisfaction = 0.7  # Nivel inicial de satisfacción
         self.tasks_completed = 0
-        self.performance_history = []
+        self.performance_history = PerformanceBuffer()
     
-    def perform_task(self, task):
+    def perform_task(self, task, rng):
         """
         Realiza una tarea y devuelve el resultado de rendimiento.
         
         Args:
             task: Objeto Task con información de la tarea
+            rng: Generador aleatorio del motor o de la organización
         
         Returns:
             dict: Diccionario con los resultados de la tarea
@@ -30,7 +102,7 @@ class Agent:
         performance = min(1.0, self.knowledge_level * (1.0 / difficulty_factor))
         
         # Añadir factor aleatorio pequeño para simular variabilidad
-        performance_with_variation = max(0, min(1.0, performance * (0.9 + random.random() * 0.2)))
+        performance_with_variation = max(0, min(1.0, performance * (0.9 + rng.random() * 0.2)))
         
         # Registrar la tarea completada
         self.tasks_completed += 1
@@ -40,7 +112,7 @@ class Agent:
         execution_time = task.duration / performance_with_variation
         
         # Calcular calidad del resultado
-        quality = performance_with_variation * (0.8 + 0.2 * random.random())
+        quality = performance_with_variation * (0.8 + 0.2 * rng.random())
         
         # Preparar resultado
         result = {
@@ -55,12 +127,43 @@ class Agent:
         
         return result
     
+    def recent_performance(self):
+        """Desempeño medio de las últimas 5 tareas."""
+        return self.performance_history.mean()
+    
+    def record_trajectory(self, enabled=True):
+        """Activa o desactiva el registro del historial completo de desempeño."""
+        history = self.performance_history
+        if enabled and history.trajectory is None:
+            history.trajectory = history.recent()
+        elif not enabled:
+            history.trajectory = None
+    
+    @property
+    def trajectory(self):
+        """Historial completo de desempeño (None si no se está registrando)."""
+        return self.performance_history.trajectory
+    
     def update_satisfaction(self, org_support=0.5):
         """Actualiza el nivel de satisfacción del agente."""
-        avg_performance = sum(self.performance_history[-5:]) / max(1, len(self.performance_history[-5:]))
+        avg_performance = self.recent_performance()
         self.satisfaction = 0.3 * self.satisfaction + 0.5 * avg_performance + 0.2 * org_support
         return self.satisfaction
     
+    def advance_satisfaction(self, org_support=0.5, periods=1):
+        """
+        Aplica varias actualizaciones de satisfacción consecutivas en forma cerrada.
+        
+        Equivale a llamar `periods` veces a update_satisfaction mientras el
+        desempeño reciente y el apoyo organizacional no cambien.
+        """
+        if periods <= 0:
+            return self.satisfaction
+        decay = 0.3 ** periods
+        target = (0.5 * self.recent_performance() + 0.2 * org_support) / 0.7
+        self.satisfaction = decay * self.satisfaction + (1 - decay) * target
+        return self.satisfaction
+    
     def learn(self, learning_rate=0.05):
         """Incrementa el nivel de conocimiento del agente."""
         self.knowledge_level = min(1.0, self.knowledge_level + learning_rate)
@@ -69,6 +172,9 @@ class Agent:
 class Manager(Agent):
     """Agente tipo Manager con capacidades de toma de decisiones."""
     
+    __slots__ = ("span_of_control", "decision_quality", "subordinates")
+    role = ROLE_MANAGER
+    
     def __init__(self, agent_id, knowledge_level=0.7, span_of_control=5, decision_quality=0.8):
         super().__init__(agent_id, knowledge_level)
         self.span_of_control = span_of_control
@@ -91,6 +197,9 @@ class Manager(Agent):
 class Worker(Agent):
     """Agente tipo Worker con capacidades de producción."""
     
+    __slots__ = ("learning_rate", "productivity", "manager")
+    role = ROLE_WORKER
+    
     def __init__(self, agent_id, knowledge_level=0.4, learning_rate=0.05, productivity=0.6):
         super().__init__(agent_id, knowledge_level)
         self.learning_rate = learning_rate
@@ -111,6 +220,9 @@ class Worker(Agent):
 class Innovator(Agent):
     """Agente tipo Innovator con capacidades de innovación."""
     
+    __slots__ = ("discovery_probability", "impact_factor", "innovations")
+    role = ROLE_INNOVATOR
+    
     def __init__(self, agent_id, knowledge_level=0.8, discovery_probability=0.1, impact_factor=2.5):
         super().__init__(agent_id, knowledge_level)
         self.discovery_probability = discovery_probability
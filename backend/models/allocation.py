@@ -0,0 +1,287 @@
+import bisect
+import heapq
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+# Tamaño máximo de los bloques de tareas de la asignación óptima
+OPTIMAL_BLOCK_SIZE = 256
+
+# Estrategias de asignación por lotes: nombre -> función
+ALLOCATION_STRATEGIES = {}
+
+def register_allocation_strategy(name, func=None, replace=False):
+    """
+    Registra una estrategia de asignación de tareas por lotes.
+    
+    La estrategia trabaja sobre arreglos y devuelve, para cada tarea, la
+    posición del agente asignado o -1 si la tarea sigue pendiente:
+        
+        func(tasks, agents, loads, capacity, rng) -> np.ndarray
+    
+    - tasks: dict con los arreglos "difficulty" e "importance", en orden de llegada
+    - agents: dict con los arreglos "knowledge" y "productivity"
+    - loads: Tareas en curso de cada agente
+    - capacity: Tareas nuevas por agente y período (política task_capacity)
+    - rng: Generador aleatorio del motor
+    
+    Puede usarse como decorador: @register_allocation_strategy("Nombre").
+    
+    Args:
+        name: Valor de task_allocation que selecciona la estrategia
+        func: Función de asignación
+        replace: Permitir sustituir una estrategia ya registrada
+    """
+    def register(func):
+        if name in ALLOCATION_STRATEGIES and not replace:
+            raise ValueError(f"Ya existe una estrategia de asignación llamada {name}")
+        ALLOCATION_STRATEGIES[name] = func
+        return func
+    
+    if func is None:
+        return register
+    return register(func)
+
+def get_allocation_strategy(name):
+    """Devuelve la estrategia registrada con ese nombre (Balanced si no existe)."""
+    return ALLOCATION_STRATEGIES.get(name, ALLOCATION_STRATEGIES["Balanced"])
+
+def check_capacity(capacity):
+    """Valida la capacidad de tareas por worker."""
+    if capacity < 1:
+        raise ValueError("La capacidad de tareas por worker debe ser al menos 1")
+
+def least_loaded_assignment(loads, num_tasks):
+    """
+    Reparte tareas una a una al agente con menor carga.
+    
+    Usa un montículo de (carga, índice), de modo que cada asignación es
+    O(log A); los empates se resuelven a favor del agente de menor índice.
+    
+    Args:
+        loads: Carga actual de cada agente (tareas en curso)
+        num_tasks: Número de tareas a repartir
+    
+    Returns:
+        list: Índice del agente elegido para cada tarea, en orden
+    """
+    heap = [(load, index) for index, load in enumerate(loads)]
+    if not heap:
+        return []
+    heapq.heapify(heap)
+    
+    chosen = []
+    for _ in range(num_tasks):
+        load, index = heap[0]
+        chosen.append(index)
+        heapq.heapreplace(heap, (load + 1, index))
+    return chosen
+
+def balanced_assignment(knowledge, difficulty):
+    """
+    Asigna cada tarea al agente con mejor puntaje combinado de habilidad y carga.
+    
+    El puntaje es 0.8 * conocimiento / dificultad + 0.2 / (carga + 1), con la
+    carga de las asignaciones hechas en esta misma llamada. Cada tarea se
+    puntúa contra todos los agentes con una sola operación de arreglos y el
+    término de carga se actualiza solo para el agente elegido, así que el
+    coste es O(T × A). Los empates se resuelven a favor del agente de menor
+    índice.
+    
+    Args:
+        knowledge: Nivel de conocimiento de cada agente
+        difficulty: Dificultad de cada tarea, en orden de asignación
+    
+    Returns:
+        np.ndarray: Índice del agente elegido para cada tarea
+    """
+    knowledge = np.asarray(knowledge, dtype=float)
+    workload = np.zeros(len(knowledge))
+    availability = 0.2 * (1.0 / (workload + 1))
+    chosen = np.empty(len(difficulty), dtype=np.int64)
+    
+    for k, task_difficulty in enumerate(np.asarray(difficulty, dtype=float).tolist()):
+        best = int(np.argmax(0.8 * (knowledge / task_difficulty) + availability))
+        chosen[k] = best
+        workload[best] += 1
+        availability[best] = 0.2 * (1.0 / (workload[best] + 1))
+    return chosen
+
+def optimal_assignment(difficulty, importance, knowledge, productivity, capacity=1,
+                       block_size=OPTIMAL_BLOCK_SIZE):
+    """
+    Asignación óptima de tareas a workers con scipy.optimize.linear_sum_assignment.
+    
+    El beneficio de dar una tarea a un worker es su importancia por el
+    progreso esperado, importancia × min(1, productividad × conocimiento /
+    dificultad). Cada worker ofrece `capacity` puestos. Las tareas se
+    recorren por importancia y dificultad descendentes en bloques de como
+    mucho `block_size`, y cada bloque se resuelve sobre los puestos que
+    siguen libres, de modo que el tamaño del problema está acotado aunque
+    haya miles de tareas por período.
+    
+    Args:
+        difficulty: Dificultad de cada tarea
+        importance: Importancia de cada tarea
+        knowledge: Conocimiento de cada worker
+        productivity: Productividad de cada worker
+        capacity: Número máximo de tareas nuevas por worker
+        block_size: Número máximo de tareas por bloque
+    
+    Returns:
+        tuple: (posiciones de las tareas asignadas, posiciones de sus workers)
+    """
+    check_capacity(capacity)
+    
+    difficulty = np.asarray(difficulty, dtype=float)
+    importance = np.asarray(importance, dtype=float)
+    output = np.asarray(productivity, dtype=float) * np.asarray(knowledge, dtype=float)
+    
+    priority = np.lexsort((-difficulty, -importance))
+    slots = np.repeat(np.arange(len(output)), capacity)  # Worker de cada puesto libre
+    task_pos = []
+    agent_pos = []
+    
+    for start in range(0, len(priority), block_size):
+        if len(slots) == 0:
+            break
+        block = priority[start:start + block_size]
+        benefit = importance[block, None] * np.minimum(1.0, output[slots] / difficulty[block, None])
+        rows, cols = linear_sum_assignment(benefit, maximize=True)
+        task_pos.append(block[rows])
+        agent_pos.append(slots[cols])
+        slots = np.delete(slots, cols)
+    
+    if not task_pos:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(task_pos), np.concatenate(agent_pos)
+
+@register_allocation_strategy("Skill-based")
+def skill_based_strategy(tasks, agents, loads, capacity, rng):
+    """Tareas por importancia y dificultad hasta la capacidad; la más difícil al agente más calificado."""
+    check_capacity(capacity)
+    difficulty = tasks["difficulty"]
+    chosen = np.full(len(difficulty), -1, dtype=np.int64)
+    
+    priority = np.lexsort((-difficulty, -tasks["importance"]))
+    selected = priority[:capacity * len(agents["knowledge"])]
+    selected = selected[np.argsort(-difficulty[selected], kind="stable")]
+    agent_order = np.argsort(-agents["knowledge"], kind="stable")
+    chosen[selected] = np.repeat(agent_order, capacity)[:len(selected)]
+    return chosen
+
+@register_allocation_strategy("Availability-based")
+def availability_strategy(tasks, agents, loads, capacity, rng):
+    """Cada tarea al agente con menor carga, incluidas las tareas en curso."""
+    chosen = least_loaded_assignment(np.asarray(loads).tolist(), len(tasks["difficulty"]))
+    return np.array(chosen, dtype=np.int64)
+
+@register_allocation_strategy("Random")
+def random_strategy(tasks, agents, loads, capacity, rng):
+    """Cada tarea a un agente elegido al azar."""
+    return rng.integers(0, len(agents["knowledge"]), len(tasks["difficulty"]))
+
+@register_allocation_strategy("Balanced")
+def balanced_strategy(tasks, agents, loads, capacity, rng):
+    """Puntaje combinado: 80% habilidad, 20% disponibilidad."""
+    return balanced_assignment(agents["knowledge"], tasks["difficulty"])
+
+@register_allocation_strategy("Optimal")
+def optimal_strategy(tasks, agents, loads, capacity, rng):
+    """Asignación óptima de importancia × progreso esperado."""
+    chosen = np.full(len(tasks["difficulty"]), -1, dtype=np.int64)
+    task_pos, agent_pos = optimal_assignment(tasks["difficulty"], tasks["importance"],
+                                             agents["knowledge"], agents["productivity"], capacity)
+    chosen[task_pos] = agent_pos
+    return chosen
+
+class SkillAllocator:
+    """
+    Asignación por habilidad con capacidad por worker.
+    
+    Mantiene entre períodos dos estructuras:
+    
+    - una cola de prioridad de tareas pendientes ordenada por importancia y
+      dificultad (descendentes), con borrado perezoso de las tareas que
+      dejan de estar pendientes por otra vía;
+    - un índice de workers ordenado por conocimiento en el que solo se
+      recolocan, con bisect, los workers cuyo conocimiento ha cambiado.
+    
+    En cada asignación se extraen como mucho capacidad × workers tareas de
+    la cola, O(log n) por tarea, y se emparejan por dificultad con los
+    puestos de los workers: la tarea más difícil va al más calificado. Las
+    tareas que no caben siguen en la cola para el período siguiente.
+    """
+    
+    def __init__(self, tasks=None):
+        """
+        Args:
+            tasks: Tareas pendientes con las que iniciar la cola (opcional)
+        """
+        self.queue = []  # Heap de (-importancia, -dificultad, task_id, tarea)
+        self.active = False
+        self.workers = []
+        self.levels = []  # Conocimiento indexado de cada worker
+        self.ranking = []  # (-conocimiento, posición), ordenado
+        if tasks is not None:
+            self.rebuild(tasks)
+    
+    def push(self, tasks):
+        """Añade tareas nuevas a la cola de pendientes."""
+        for task in tasks:
+            heapq.heappush(self.queue, (-task.importance, -task.difficulty, task.task_id, task))
+    
+    def rebuild(self, tasks):
+        """Reconstruye la cola a partir de las tareas pendientes y la activa."""
+        self.queue = [(-t.importance, -t.difficulty, t.task_id, t) for t in tasks]
+        heapq.heapify(self.queue)
+        self.active = True
+    
+    def clear(self):
+        """Vacía la cola mientras se usa otra estrategia de asignación."""
+        self.queue = []
+        self.active = False
+    
+    def rank_workers(self, workers):
+        """Actualiza el índice de workers y devuelve sus posiciones por conocimiento descendente."""
+        if len(workers) != len(self.workers) or any(a is not b for a, b in zip(workers, self.workers)):
+            # Plantilla distinta: reconstruir el índice
+            self.workers = list(workers)
+            self.levels = [w.knowledge_level for w in workers]
+            self.ranking = sorted((-level, i) for i, level in enumerate(self.levels))
+        else:
+            for i, worker in enumerate(workers):
+                level = worker.knowledge_level
+                if level != self.levels[i]:
+                    del self.ranking[bisect.bisect_left(self.ranking, (-self.levels[i], i))]
+                    bisect.insort(self.ranking, (-level, i))
+                    self.levels[i] = level
+        return [i for _, i in self.ranking]
+    
+    def allocate(self, workers, capacity=1):
+        """
+        Asigna tareas de la cola a los workers.
+        
+        Args:
+            workers: Lista de workers disponibles
+            capacity: Número máximo de tareas nuevas por worker y período
+        
+        Returns:
+            dict: Asignaciones task_id -> agent_id
+        """
+        check_capacity(capacity)
+        
+        slots = capacity * len(workers)
+        selected = []
+        while self.queue and len(selected) < slots:
+            task = heapq.heappop(self.queue)[3]
+            if task.status == "pending":
+                selected.append(task)
+        
+        if not selected:
+            return {}
+        
+        # Tarea más difícil al worker más calificado, `capacity` puestos por worker
+        selected.sort(key=lambda t: t.difficulty, reverse=True)
+        ranking = self.rank_workers(workers)
+        return {task.task_id: workers[ranking[k // capacity]].agent_id for k, task in enumerate(selected)}
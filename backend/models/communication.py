@@ -0,0 +1,120 @@
+import numpy as np
+from scipy import sparse
+
+def sample_pairs(n, p, rng):
+    """
+    Muestrea los pares i < j de un grafo aleatorio de Erdős–Rényi G(n, p).
+    
+    En lugar de una extracción por par, salta directamente de un par
+    elegido al siguiente con saltos geométricos (Batagelj–Brandes) sobre el
+    índice lineal de los pares, en bloques vectorizados, así que el coste es
+    O(n + aristas) y no O(n²).
+    
+    Args:
+        n: Número de nodos
+        p: Probabilidad de cada arista
+        rng: Generador aleatorio de NumPy
+    
+    Returns:
+        tuple: Arreglos (i, j) con i < j, ordenados por j y después por i
+    """
+    total = n * (n - 1) // 2
+    if total == 0 or p <= 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    
+    # Saltos geométricos hasta sobrepasar el último par; un salto mayor que
+    # total ya cae fuera, así que se recorta para que la suma no desborde int64
+    chunks = []
+    position = -1
+    expected = total * min(p, 1.0)
+    block = int(expected + 5 * np.sqrt(expected) + 16)
+    while position < total:
+        gaps = np.minimum(rng.geometric(min(p, 1.0), block), total + 1)
+        linear = position + np.cumsum(gaps)
+        chunks.append(linear)
+        position = int(linear[-1])
+    linear = np.concatenate(chunks)
+    linear = linear[linear < total]
+    
+    # Índice lineal -> par (i, j): L = j (j - 1) / 2 + i
+    j = ((1 + np.sqrt(1 + 8 * linear.astype(float))) // 2).astype(np.int64)
+    j -= j * (j - 1) // 2 > linear  # Corregir el redondeo de la raíz
+    j += (j + 1) * j // 2 <= linear
+    i = linear - j * (j - 1) // 2
+    return i, j
+
+class CommunicationMatrix:
+    """
+    Matriz dispersa de comunicación entre agentes.
+    
+    Guarda solo los canales con comunicación en una matriz CSR indexada por
+    la posición entera de cada agente, con un mapa agent_id -> posición, de
+    modo que la memoria es O(canales) en lugar de O(N²). Mantiene la
+    interfaz de diccionario por pares (sender_id, receiver_id): cualquier
+    par de agentes distintos conocidos está en la matriz y los pares sin
+    canal valen 0.0.
+    """
+    
+    def __init__(self, agent_ids=(), senders=(), receivers=(), values=()):
+        """
+        Args:
+            agent_ids: Identificadores de los agentes, en orden de posición
+            senders: Posiciones de los emisores de cada canal
+            receivers: Posiciones de los receptores de cada canal
+            values: Intensidad de cada canal; si un par se repite vale el último
+        """
+        self.agent_ids = list(agent_ids)
+        self.index = {agent_id: i for i, agent_id in enumerate(self.agent_ids)}
+        size = len(self.agent_ids)
+        
+        senders = np.asarray(senders, dtype=np.int64)
+        receivers = np.asarray(receivers, dtype=np.int64)
+        values = np.asarray(values, dtype=float)
+        
+        # Conservar la última escritura de cada par, como al asignar en un diccionario
+        keys = senders * size + receivers
+        _, last = np.unique(keys[::-1], return_index=True)
+        keep = len(keys) - 1 - last
+        
+        self.matrix = sparse.csr_matrix((values[keep], (senders[keep], receivers[keep])), shape=(size, size))
+        self.matrix.sort_indices()
+    
+    @property
+    def shape(self):
+        """Dimensiones de la matriz (agentes × agentes)."""
+        return self.matrix.shape
+    
+    @property
+    def nnz(self):
+        """Número de canales almacenados."""
+        return self.matrix.nnz
+    
+    def __len__(self):
+        # Pares de agentes distintos, como en la matriz densa original
+        size = len(self.agent_ids)
+        return size * (size - 1)
+    
+    def __contains__(self, pair):
+        sender, receiver = pair
+        return sender != receiver and sender in self.index and receiver in self.index
+    
+    def __getitem__(self, pair):
+        if pair not in self:
+            raise KeyError(pair)
+        return self.value(self.index[pair[0]], self.index[pair[1]])
+    
+    def get(self, pair, default=None):
+        """Intensidad de comunicación de un par de ids, o `default` si no está en la matriz."""
+        if pair not in self:
+            return default
+        return self.value(self.index[pair[0]], self.index[pair[1]])
+    
+    def value(self, i, j):
+        """Intensidad de comunicación entre las posiciones i y j (0.0 sin canal)."""
+        indptr = self.matrix.indptr
+        start, end = indptr[i], indptr[i + 1]
+        k = start + np.searchsorted(self.matrix.indices[start:end], j)
+        if k < end and self.matrix.indices[k] == j:
+            return float(self.matrix.data[k])
+        return 0.0
@@ -1,11 +1,18 @@
-import random
 import networkx as nx
+import numpy as np
 from collections import defaultdict
+from backend.core.rng import make_rng
+from backend.models.agents import ROLE_MANAGER, ROLE_WORKER, ROLE_INNOVATOR, ROLE_NAMES
+from backend.models.communication import CommunicationMatrix, sample_pairs
+
+def _no_links():
+    """Par de arreglos vacíos de posiciones (origen, destino)."""
+    return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
 
 class Organization:
     """Modelo para representar la estructura organizacional."""
     
-    def __init__(self, scenario_type, hierarchy_depth=3, span_of_control=5, centralization=0.5):
+    def __init__(self, scenario_type, hierarchy_depth=3, span_of_control=5, centralization=0.5, rng=None):
         self.scenario_type = scenario_type
         self.hierarchy_depth = hierarchy_depth
         self.span_of_control = span_of_control
@@ -15,115 +22,233 @@ class Organization:
         self.workers = []
         self.innovators = []
         self.all_agents = []
+        self.agent_index = {}  # Índice agent_id -> Agent
         self.network = nx.DiGraph()  # Grafo de la estructura organizacional
-        self.communication_matrix = {}  # Matriz de comunicación entre agentes
+        self.communication_matrix = CommunicationMatrix()  # Matriz dispersa de comunicación entre agentes
+        self.rng = make_rng(rng)  # Flujo aleatorio propio de la organización
+        self._reset_structure()
+    
+    def _reset_structure(self):
+        """Descarta la jerarquía y los canales de comunicación construidos."""
+        self.hierarchy_links = _no_links()  # Posiciones (superior, subordinado) en all_agents
+        self.horizontal_links = _no_links()  # Posiciones (i, j) de los canales horizontales
+        self.hierarchy_edges = {}  # Aristas de build_hierarchy: (origen, destino) -> tipo
+        self.horizontal_edges = set()  # Aristas horizontales del grafo
+        self.vertical_comm = None  # Intensidades con las que se construyó la comunicación
+        self.horizontal_comm = None
     
     def add_agent(self, agent):
         """Añade un agente a la organización."""
         self.all_agents.append(agent)
+        self.agent_index[agent.agent_id] = agent
         
-        if agent.__class__.__name__ == "Manager":
+        if agent.role == ROLE_MANAGER:
             self.managers.append(agent)
-        elif agent.__class__.__name__ == "Worker":
+        elif agent.role == ROLE_WORKER:
             self.workers.append(agent)
-        elif agent.__class__.__name__ == "Innovator":
+        elif agent.role == ROLE_INNOVATOR:
             self.innovators.append(agent)
         
         # Añadir nodo al grafo
         self.network.add_node(agent.agent_id, 
-                             type=agent.__class__.__name__, 
+                             type=ROLE_NAMES.get(agent.role, agent.__class__.__name__), 
                              knowledge=agent.knowledge_level)
     
+    def reset_agents(self):
+        """Elimina todos los agentes de la organización, junto con su red."""
+        self.managers = []
+        self.workers = []
+        self.innovators = []
+        self.all_agents = []
+        self.agent_index = {}
+        self.network = nx.DiGraph()
+        self.communication_matrix = CommunicationMatrix()
+        self._reset_structure()
+    
+    def _remove_edges(self, edges, edge_type=None):
+        """Quita del grafo las aristas indicadas que sigan existiendo (y sean del tipo dado)."""
+        network = self.network
+        self.network.remove_edges_from([
+            (u, v) for u, v in edges
+            if network.has_edge(u, v) and (edge_type is None or network[u][v]["type"] == edge_type)
+        ])
+    
+    def clear_hierarchy(self):
+        """Elimina la jerarquía actual: subordinados, managers de los workers y sus aristas."""
+        for manager in self.managers:
+            manager.subordinates = []
+        for worker in self.workers:
+            worker.manager = None
+        
+        previous = self.hierarchy_edges
+        for edge_type in ("hierarchical", "innovation"):
+            self._remove_edges([edge for edge, kind in previous.items() if kind == edge_type], edge_type)
+        self.hierarchy_edges = {}
+        self.hierarchy_links = _no_links()
+        
+        # Restaurar los canales horizontales que coincidían con aristas eliminadas
+        overlap = [edge for edge in previous if edge in self.horizontal_edges]
+        self.network.add_edges_from(overlap, type="horizontal")
+    
     def build_hierarchy(self):
-        """Construye la estructura jerárquica basada en los parámetros."""
+        """
+        Construye la estructura jerárquica basada en los parámetros.
+        
+        Sustituye la jerarquía anterior sin tocar los canales horizontales,
+        así que puede llamarse de nuevo al cambiar la profundidad o el tramo
+        de control. Cada nivel se reparte sobre posiciones enteras: el
+        subordinado k de un nivel depende del superior k // span_of_control,
+        con un coste O(N).
+        """
+        self.clear_hierarchy()
+        
         # Asegurarse de que hay al menos un manager
         if not self.managers:
             return
         
-        # El primer manager es el CEO
-        ceo = self.managers[0]
-        level_agents = {0: [ceo]}
+        agents = self.all_agents
+        ids = [agent.agent_id for agent in agents]
+        position = {agent_id: i for i, agent_id in enumerate(ids)}
+        managers = np.array([position[m.agent_id] for m in self.managers], dtype=np.int64)
+        workers = np.array([position[w.agent_id] for w in self.workers], dtype=np.int64)
+        span = max(0, self.span_of_control)
+        
+        # El primer manager es el CEO; los niveles intermedios toman managers sin
+        # repetirlos y el último nivel son los workers
+        level_agents = [managers[:1]]
+        parents = managers[:1]
+        next_manager = 1
+        superiors = [np.empty(0, dtype=np.int64)]
+        subordinates = [np.empty(0, dtype=np.int64)]
         
-        # Construir niveles
         for level in range(1, self.hierarchy_depth):
-            level_agents[level] = []
-            
-            # Asignar managers o workers a cada nivel
-            agents_for_level = self.managers[1:] if level < self.hierarchy_depth - 1 else self.workers
-            index = 0
+            if level < self.hierarchy_depth - 1:
+                pool = managers[next_manager:]
+            else:
+                pool = workers
             
-            for parent in level_agents[level - 1]:
-                # Determinar subordinados para este padre
-                num_subordinates = min(self.span_of_control, len(agents_for_level) - index)
-                
-                for _ in range(num_subordinates):
-                    if index < len(agents_for_level):
-                        subordinate = agents_for_level[index]
-                        
-                        # Crear relación jerárquica
-                        if hasattr(parent, 'assign_subordinate'):
-                            parent.assign_subordinate(subordinate)
-                        
-                        if hasattr(subordinate, 'manager'):
-                            subordinate.manager = parent
-                        
-                        # Añadir al grafo
-                        self.network.add_edge(parent.agent_id, subordinate.agent_id, type="hierarchical")
-                        
-                        # Añadir a este nivel
-                        level_agents[level].append(subordinate)
-                        index += 1
+            # Un nivel vacío deja sin superiores a los siguientes, que también quedan vacíos
+            count = min(len(pool), len(parents) * span)
+            children = pool[:count]
+            level_agents.append(children)
+            if level < self.hierarchy_depth - 1:
+                next_manager += count
+            superiors.append(parents[np.arange(count) // span])
+            subordinates.append(children)
+            parents = children
+        
+        superiors = np.concatenate(superiors)
+        subordinates = np.concatenate(subordinates)
+        
+        # Relaciones entre agentes y aristas jerárquicas
+        edges = []
+        for parent, child in zip(superiors.tolist(), subordinates.tolist()):
+            superior, subordinate = agents[parent], agents[child]
+            superior.assign_subordinate(subordinate)
+            if subordinate.role == ROLE_WORKER:
+                subordinate.manager = superior
+            edges.append((ids[parent], ids[child]))
         
         # Conectar innovadores según la centralización
+        innovation_edges = []
         for innovator in self.innovators:
             # Con alta centralización, se conectan a niveles altos
-            if random.random() < self.centralization:
+            if self.rng.random() < self.centralization:
                 connect_to = level_agents[0][0]  # CEO
             else:
                 # Seleccionar un nivel al azar (preferentemente bajo con baja centralización)
-                level = random.choices(range(self.hierarchy_depth), 
-                                      weights=[self.centralization**i for i in range(self.hierarchy_depth)])[0]
-                if level_agents[level]:
-                    connect_to = random.choice(level_agents[level])
+                weights = [self.centralization**i for i in range(self.hierarchy_depth)]
+                level = int(self.rng.choice(self.hierarchy_depth, p=[w / sum(weights) for w in weights]))
+                if len(level_agents[level]):
+                    connect_to = level_agents[level][self.rng.integers(len(level_agents[level]))]
                 else:
                     connect_to = level_agents[0][0]  # Default CEO
             
-            # Añadir conexión
-            self.network.add_edge(connect_to.agent_id, innovator.agent_id, type="innovation")
-            self.network.add_edge(innovator.agent_id, connect_to.agent_id, type="innovation")
+            innovation_edges.append((ids[connect_to], innovator.agent_id))
+            innovation_edges.append((innovator.agent_id, ids[connect_to]))
+        
+        self.network.add_edges_from(edges, type="hierarchical")
+        self.network.add_edges_from(innovation_edges, type="innovation")
+        self.hierarchy_edges = dict.fromkeys(edges, "hierarchical")
+        self.hierarchy_edges.update(dict.fromkeys(innovation_edges, "innovation"))
+        self.hierarchy_links = (superiors, subordinates)
+        
+        # Los canales horizontales prevalecen sobre las aristas nuevas del mismo par
+        self.network.add_edges_from([edge for edge in self.hierarchy_edges if edge in self.horizontal_edges],
+                                    type="horizontal")
     
     def build_communication_network(self, vertical_comm=0.7, horizontal_comm=0.4):
-        """Construye la red de comunicación entre agentes."""
-        # Inicializar matriz de comunicación
-        for a1 in self.all_agents:
-            for a2 in self.all_agents:
-                if a1.agent_id != a2.agent_id:
-                    self.communication_matrix[(a1.agent_id, a2.agent_id)] = 0.0
-        
-        # Añadir comunicación vertical (jerárquica)
-        for edge in self.network.edges(data=True):
-            if edge[2]['type'] == 'hierarchical':
-                self.communication_matrix[(edge[0], edge[1])] = vertical_comm
-                self.communication_matrix[(edge[1], edge[0])] = vertical_comm * 0.8  # Algo menor hacia arriba
+        """
+        Construye la red de comunicación entre agentes.
+        
+        Vuelve a muestrear los canales horizontales, que sustituyen a los
+        anteriores en el grafo; la comunicación vertical sale de la jerarquía
+        actual (ver update_vertical_comm).
+        """
+        # Quitar los canales horizontales anteriores, restaurando las aristas jerárquicas que ocultaban
+        previous = self.horizontal_edges
+        self._remove_edges(previous, "horizontal")
+        for edge_type in ("hierarchical", "innovation"):
+            self.network.add_edges_from(
+                [edge for edge, kind in self.hierarchy_edges.items() if kind == edge_type and edge in previous],
+                type=edge_type
+            )
         
         # Añadir comunicación horizontal (entre pares)
         node_levels = defaultdict(list)
         
         # Agrupar nodos por tipo para comunicación horizontal
-        for agent in self.all_agents:
-            node_levels[agent.__class__.__name__].append(agent.agent_id)
+        for i, agent in enumerate(self.all_agents):
+            node_levels[agent.role].append(i)
+        
+        # Conectar horizontalmente con cierta probabilidad: grafo aleatorio por tipo,
+        # muestreado en O(aristas) sin recorrer todos los pares
+        ids = [agent.agent_id for agent in self.all_agents]
+        firsts = [np.empty(0, dtype=np.int64)]
+        seconds = [np.empty(0, dtype=np.int64)]
+        edges = []
         
-        # Conectar horizontalmente con cierta probabilidad
         for agent_type, nodes in node_levels.items():
-            for i in range(len(nodes)):
-                for j in range(i+1, len(nodes)):
-                    if random.random() < horizontal_comm:
-                        self.communication_matrix[(nodes[i], nodes[j])] = horizontal_comm
-                        self.communication_matrix[(nodes[j], nodes[i])] = horizontal_comm
-                        
-                        # Añadir al grafo
-                        self.network.add_edge(nodes[i], nodes[j], type="horizontal")
-                        self.network.add_edge(nodes[j], nodes[i], type="horizontal")
+            nodes = np.array(nodes, dtype=np.int64)
+            first, second = sample_pairs(len(nodes), horizontal_comm, self.rng)
+            first, second = nodes[first], nodes[second]
+            firsts.append(first)
+            seconds.append(second)
+            
+            pairs = list(zip(first.tolist(), second.tolist()))
+            edges += [(ids[a], ids[b]) for a, b in pairs]
+            edges += [(ids[b], ids[a]) for a, b in pairs]
+        
+        # Añadir al grafo
+        self.network.add_edges_from(edges, type="horizontal")
+        self.horizontal_edges = set(edges)
+        self.horizontal_links = (np.concatenate(firsts), np.concatenate(seconds))
+        self.horizontal_comm = horizontal_comm
+        self.update_vertical_comm(vertical_comm)
+    
+    def update_vertical_comm(self, vertical_comm):
+        """
+        Recalcula la matriz de comunicación con una nueva intensidad vertical.
+        
+        Reutiliza la jerarquía y los canales horizontales ya construidos, sin
+        volver a muestrearlos ni modificar el grafo.
+        """
+        superiors, subordinates = self.hierarchy_links
+        first, second = self.horizontal_links
+        horizontal_comm = self.horizontal_comm if self.horizontal_comm is not None else 0.0
+        self.vertical_comm = vertical_comm
+        
+        # Vertical: hacia abajo y algo menor hacia arriba; los canales horizontales prevalecen
+        self.communication_matrix = CommunicationMatrix(
+            [agent.agent_id for agent in self.all_agents],
+            np.concatenate([superiors, subordinates, first, second]),
+            np.concatenate([subordinates, superiors, second, first]),
+            np.concatenate([
+                np.full(len(superiors), float(vertical_comm)),
+                np.full(len(superiors), vertical_comm * 0.8),
+                np.full(2 * len(first), float(horizontal_comm))
+            ])
+        )
     
     def allocate_budget(self, training_budget=0.3, innovation_budget=0.2):
         """Asigna presupuesto para formación e innovación."""
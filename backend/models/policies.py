@@ -1,9 +1,12 @@
-import random
+import numpy as np
+
+from backend.core.rng import make_rng
+from backend.models.allocation import get_allocation_strategy
 
 class OrganizationalPolicies:
     """Modelo para las políticas organizacionales."""
     
-    def __init__(self):
+    def __init__(self, rng=None):
         # Parámetros base de políticas
         self.centralization = 0.5
         self.training_budget = 30  # Porcentaje
@@ -13,7 +16,9 @@ class OrganizationalPolicies:
         self.hierarchy_depth = 3
         self.span_of_control = 5
         self.task_allocation = "Skill-based"
+        self.task_capacity = 1  # Tareas nuevas por worker y período (Skill-based y Optimal)
         self.learning_method = "Mixed"
+        self.rng = make_rng(rng)  # Flujo aleatorio por defecto para la asignación
     
     def update_from_dict(self, policy_dict):
         """Actualiza las políticas desde un diccionario de configuración."""
@@ -34,57 +39,47 @@ class OrganizationalPolicies:
         else:  # Mixed
             return base_rate * 1.2
     
-    def allocate_task(self, tasks, agents):
-        """Asigna tareas a agentes según la política de asignación."""
-        assignments = {}
+    def allocate_task(self, tasks, agents, rng=None, loads=None):
+        """
+        Asigna tareas a agentes según la política de asignación.
         
-        if self.task_allocation == "Skill-based":
-            # Ordenar tareas por dificultad (descendente)
-            sorted_tasks = sorted(tasks, key=lambda t: t.difficulty, reverse=True)
-            # Ordenar agentes por conocimiento (descendente)
-            sorted_agents = sorted(agents, key=lambda a: a.knowledge_level, reverse=True)
-            
-            # Asignar tarea más difícil al agente más calificado
-            for i, task in enumerate(sorted_tasks):
-                if i < len(sorted_agents):
-                    assignments[task.task_id] = sorted_agents[i].agent_id
+        La estrategia se busca en el registro de backend.models.allocation
+        (register_allocation_strategy); los nombres desconocidos usan Balanced.
         
-        elif self.task_allocation == "Availability-based":
-            # Asignar según la carga de trabajo actual
-            agents_workload = {a.agent_id: len([t for t in assignments.values() if t == a.agent_id]) 
-                              for a in agents}
-            
-            for task in tasks:
-                if task.task_id not in assignments:
-                    # Encontrar el agente con menor carga
-                    agent_id = min(agents_workload.items(), key=lambda x: x[1])[0]
-                    assignments[task.task_id] = agent_id
-                    agents_workload[agent_id] += 1
+        Args:
+            tasks: Lista de tareas pendientes
+            agents: Lista de agentes disponibles
+            rng: Generador aleatorio del motor (por defecto el de las políticas)
+            loads: Tareas en curso por agente (agent_id -> número), de períodos anteriores
         
-        elif self.task_allocation == "Random":
-            # Asignación aleatoria
-            for task in tasks:
-                if task.task_id not in assignments:
-                    agent = random.choice(agents)
-                    assignments[task.task_id] = agent.agent_id
+        Returns:
+            dict: Asignaciones task_id -> agent_id
+        """
+        rng = rng if rng is not None else self.rng
+        if not tasks or not agents:
+            return {}
         
-        else:  # Balanced
-            # Asignar balanceando habilidad y carga
-            for task in tasks:
-                if task.task_id not in assignments:
-                    # Calcular puntaje combinado (80% habilidad, 20% disponibilidad)
-                    scores = []
-                    for agent in agents:
-                        workload = len([t for t in assignments.values() if t == agent.agent_id])
-                        skill_match = agent.knowledge_level / task.difficulty
-                        balanced_score = 0.8 * skill_match + 0.2 * (1.0 / (workload + 1))
-                        scores.append((agent.agent_id, balanced_score))
-                    
-                    # Asignar al agente con mejor puntaje
-                    best_agent_id = max(scores, key=lambda x: x[1])[0]
-                    assignments[task.task_id] = best_agent_id
+        # Las estrategias registradas trabajan sobre arreglos de atributos
+        loads = loads or {}
+        strategy = get_allocation_strategy(self.task_allocation)
+        chosen = strategy(
+            {
+                "difficulty": np.array([t.difficulty for t in tasks], dtype=float),
+                "importance": np.array([t.importance for t in tasks], dtype=float)
+            },
+            {
+                "knowledge": np.array([a.knowledge_level for a in agents], dtype=float),
+                "productivity": np.array([getattr(a, 'productivity', 0.0) for a in agents], dtype=float)
+            },
+            np.array([loads.get(a.agent_id, 0) for a in agents], dtype=np.int64),
+            self.task_capacity,
+            rng
+        )
         
-        return assignments
+        return {
+            task.task_id: agents[index].agent_id
+            for task, index in zip(tasks, np.asarray(chosen).tolist()) if index >= 0
+        }
     
     def calculate_communication_effectiveness(self, sender, receiver, organization):
         """Calcula la efectividad de comunicación entre dos agentes."""
@@ -1,6 +1,7 @@
 import optuna
 import logging
 import numpy as np
+from backend.core.rng import make_seed_sequence, child_seed
 from backend.simulations.simulator import Simulator
 
 # Configurar logging
@@ -10,18 +11,20 @@ logger = logging.getLogger(__name__)
 class PolicyOptimizer:
     """Optimizador de políticas organizacionales utilizando Optuna."""
     
-    def __init__(self, scenario_type, agent_config, iterations=1, periods=50):
+    def __init__(self, scenario_type, agent_config, iterations=1, periods=50, seed=None, report_every=10):
         self.scenario_type = scenario_type
         self.agent_config = agent_config
         self.iterations = iterations
         self.periods = periods
+        self.report_every = max(1, report_every)  # Períodos entre valores intermedios para la poda
+        self.seed_sequence = make_seed_sequence(seed)
         self.best_params = None
         self.best_value = None
     
     def objective(self, trial, target="Balanced"):
         """Función objetivo para Optuna."""
-        # Crear simulador
-        simulator = Simulator()
+        # Crear simulador con un flujo aleatorio reproducible propio del trial
+        simulator = Simulator(seed=child_seed(self.seed_sequence, trial.number))
         simulator.setup_scenario(self.scenario_type)
         simulator.setup_agents(self.agent_config)
         
@@ -43,7 +46,7 @@ class PolicyOptimizer:
         # Seleccionar método de asignación de tareas
         policy_params["task_allocation"] = trial.suggest_categorical(
             "task_allocation", 
-            ["Skill-based", "Availability-based", "Balanced"]
+            ["Skill-based", "Availability-based", "Balanced", "Optimal"]
         )
         
         # Seleccionar método de aprendizaje
@@ -55,35 +58,46 @@ class PolicyOptimizer:
         # Actualizar políticas
         simulator.update_policies(policy_params)
         
-        # Ejecutar simulación
-        results = simulator.run(iterations=self.iterations, periods=self.periods)
-        
-        # Calcular métricas objetivo según el target
-        metrics = results["results_df"].groupby("iteration").mean()
+        # Ejecutar simulación período a período, acumulando el objetivo. Con
+        # iteraciones de igual longitud, la media de todos los períodos coincide
+        # con la media de las medias por iteración.
+        total = 0.0
+        step = 0
+        for step, summary in enumerate(simulator.iter_run(iterations=self.iterations, periods=self.periods), 1):
+            total += self.period_objective(summary, target)
+            
+            # Informar del valor intermedio y abandonar los trials poco prometedores
+            if step % self.report_every == 0:
+                trial.report(total / step, step)
+                if trial.should_prune():
+                    raise optuna.TrialPruned()
         
+        return total / max(1, step)
+    
+    @staticmethod
+    def period_objective(summary, target="Balanced"):
+        """Calcula el valor objetivo de un período a partir de su resumen."""
         if target == "Productivity":
-            objective_value = metrics["productivity"].mean()
+            return summary["productivity"]
         elif target == "Cost Efficiency":
-            objective_value = metrics["cost_efficiency"].mean()
+            return summary["cost_efficiency"]
         elif target == "Innovation Rate":
-            objective_value = metrics["innovation_rate"].mean()
-        else:  # Balanced
-            # Combinar métricas con pesos
-            objective_value = (
-                0.4 * metrics["productivity"].mean() +
-                0.3 * metrics["cost_efficiency"].mean() +
-                0.2 * metrics["innovation_rate"].mean() +
-                0.1 * metrics["agent_satisfaction"].mean()
-            )
+            return summary["innovation_rate"]
         
-        return objective_value
+        # Balanced: combinar métricas con pesos
+        return (
+            0.4 * summary["productivity"] +
+            0.3 * summary["cost_efficiency"] +
+            0.2 * summary["innovation_rate"] +
+            0.1 * summary["agent_satisfaction"]
+        )
     
     def optimize(self, n_trials=30, target="Balanced"):
         """Ejecuta la optimización."""
         logger.info(f"Iniciando optimización para target: {target}")
         
         # Crear estudio Optuna
-        study = optuna.create_study(direction="maximize")
+        study = optuna.create_study(direction="maximize", pruner=optuna.pruners.MedianPruner())
         
         # Ejecutar optimización
         study.optimize(
@@ -104,7 +118,8 @@ class PolicyOptimizer:
             "all_trials": [
                 {
                     "params": trial.params,
-                    "value": trial.value
+                    "value": trial.value,
+                    "state": trial.state.name
                 }
                 for trial in study.trials
             ]
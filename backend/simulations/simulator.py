@@ -1,20 +1,56 @@
 import uuid
-import random
+import numpy as np
 import pandas as pd
-from backend.core.engine import SimulationEngine
+from backend.core.engine import SimulationEngine, VectorizedSimulationEngine, EventDrivenSimulationEngine
+from backend.core.ensemble import EnsembleSimulationEngine
+from backend.core.events import LogView
+from backend.core import checkpoint
+from backend.core.convergence import make_convergence
+from backend.core.rng import make_seed_sequence, spawn_seeds
 from backend.models.agents import Manager, Worker, Innovator
 from backend.models.organization import Organization
 from backend.models.policies import OrganizationalPolicies
 
+# Motores de simulación disponibles
+ENGINE_MODES = {
+    "object": SimulationEngine,
+    "vectorized": VectorizedSimulationEngine,
+    "event": EventDrivenSimulationEngine,
+    "ensemble": EnsembleSimulationEngine
+}
+
 class Simulator:
     """Orquestador principal de simulaciones."""
     
-    def __init__(self):
+    def __init__(self, seed=None):
         self.simulation_id = str(uuid.uuid4())
+        self.seed_sequence = make_seed_sequence(seed)
         self.engine = None
+        self.engine_class = SimulationEngine
+        self.engine_options = {}
         self.organization = None
         self.policies = None
     
+    def _spawn_rng(self):
+        """Crea un generador aleatorio independiente derivado de la semilla del simulador."""
+        return np.random.default_rng(spawn_seeds(self.seed_sequence, 1)[0])
+    
+    def seed(self, seed=None):
+        """
+        Reinicia los flujos aleatorios del simulador a partir de una semilla.
+        
+        La organización, las políticas y cada iteración del motor reciben
+        flujos independientes derivados de la misma SeedSequence.
+        
+        Args:
+            seed: Entero, SeedSequence o None (entropía del sistema)
+        """
+        self.seed_sequence = make_seed_sequence(seed)
+        if self.organization:
+            self.organization.rng = self._spawn_rng()
+        if self.policies:
+            self.policies.rng = self._spawn_rng()
+    
     def setup_scenario(self, scenario_type, params=None):
         """Configura el escenario de simulación según el tipo."""
         if params is None:
@@ -26,7 +62,13 @@ class Simulator:
             "market_volatility": 0.3,
             "training_cost": 1.0,
             "sim_duration": 100,
-            "decision_freq": 5
+            "decision_freq": 5,
+            "engine_mode": "object",
+            "log_level": "summary",
+            "history_window": 10000,
+            "history_dir": None,
+            "arrivals": "fixed",
+            "salaries": None
         }
         
         # Mezclar parámetros por defecto y proporcionados
@@ -83,12 +125,28 @@ class Simulator:
         else:
             raise ValueError(f"Tipo de escenario desconocido: {scenario_type}")
         
+        if params["engine_mode"] not in ENGINE_MODES:
+            raise ValueError(f"Modo de motor desconocido: {params['engine_mode']}")
+        self.engine_class = ENGINE_MODES[params["engine_mode"]]
+        self.policies.rng = self._spawn_rng()
+        self.engine_options = {
+            "log_level": params["log_level"],
+            "history_window": params["history_window"],
+            "history_dir": params["history_dir"],
+            "arrivals": params["arrivals"],
+            "salaries": params["salaries"]
+        }
+        if self.engine_class is EventDrivenSimulationEngine:
+            # Los ciclos de decisión solo los programa el motor de eventos discretos
+            self.engine_options["decision_freq"] = params["decision_freq"]
+        
         # Crear organización
         self.organization = Organization(
             scenario_type, 
             hierarchy_depth, 
             span_of_control, 
-            self.policies.centralization
+            self.policies.centralization,
+            rng=self._spawn_rng()
         )
         
         # Actualizar parámetros en las políticas
@@ -96,11 +154,13 @@ class Simulator:
         self.policies.span_of_control = span_of_control
         
         # Inicializar motor de simulación
-        self.engine = SimulationEngine(
+        self.engine = self.engine_class(
             self.organization,
             self.policies,
             params["initial_capital"],
-            params["market_volatility"]
+            params["market_volatility"],
+            seed=spawn_seeds(self.seed_sequence, 1)[0],
+            **self.engine_options
         )
     
     def setup_agents(self, agent_config):
@@ -109,10 +169,7 @@ class Simulator:
             raise ValueError("La organización no ha sido inicializada. Ejecute setup_scenario primero.")
         
         # Limpiar agentes existentes
-        self.organization.managers = []
-        self.organization.workers = []
-        self.organization.innovators = []
-        self.organization.all_agents = []
+        self.organization.reset_agents()
         
         # Configurar managers
         if "managers" in agent_config:
@@ -163,55 +220,252 @@ class Simulator:
             self.policies = OrganizationalPolicies()
         
         self.policies.update_from_dict(policy_dict)
+        organization = self.organization
+        if not organization:
+            return
         
-        # Si la estructura jerárquica ha cambiado, reconstruirla
-        if "hierarchy_depth" in policy_dict or "span_of_control" in policy_dict:
-            self.organization.hierarchy_depth = self.policies.hierarchy_depth
-            self.organization.span_of_control = self.policies.span_of_control
-            self.organization.build_hierarchy()
+        # Si la estructura jerárquica ha cambiado, reconstruir solo las aristas jerárquicas
+        structure_changed = (
+            (organization.hierarchy_depth, organization.span_of_control) !=
+            (self.policies.hierarchy_depth, self.policies.span_of_control)
+        )
+        if structure_changed:
+            organization.hierarchy_depth = self.policies.hierarchy_depth
+            organization.span_of_control = self.policies.span_of_control
+            organization.build_hierarchy()
         
-        # Si la comunicación ha cambiado, actualizar la red
-        if "vertical_comm" in policy_dict or "horizontal_comm" in policy_dict:
-            self.organization.build_communication_network(
+        # Actualizar la comunicación con el mínimo trabajo: los canales horizontales
+        # solo se vuelven a muestrear si cambia su probabilidad
+        if organization.horizontal_comm != self.policies.horizontal_comm:
+            organization.build_communication_network(
                 self.policies.vertical_comm,
                 self.policies.horizontal_comm
             )
+        elif structure_changed or organization.vertical_comm != self.policies.vertical_comm:
+            organization.update_vertical_comm(self.policies.vertical_comm)
     
-    def run(self, iterations=1, periods=100):
-        """Ejecuta la simulación con los parámetros configurados."""
+    def burn_in(self, periods):
+        """
+        Ejecuta un período de calentamiento sobre el motor actual.
+        
+        El estado resultante puede bifurcarse con fork para evaluar variantes
+        de políticas a partir del período alcanzado.
+        """
         if not self.engine:
             raise ValueError("El motor de simulación no ha sido inicializado")
+        return self.engine.run_simulation(periods)
+    
+    def fork(self, policy_dict=None, seed=None):
+        """
+        Crea una copia independiente del simulador en su estado actual.
+        
+        Args:
+            policy_dict: Políticas a aplicar en la copia (opcional)
+            seed: Semilla para flujos aleatorios nuevos del motor, la organización
+                  y las políticas; si no se indica, la copia reproduce los mismos
+                  números aleatorios que el original
+        
+        Returns:
+            Simulator: Simulador bifurcado con nuevo ID
+        """
+        forked = checkpoint.clone(self)
+        forked.simulation_id = str(uuid.uuid4())
         
+        if seed is not None:
+            forked.seed(seed)
+            if forked.engine:
+                forked.engine.reseed(spawn_seeds(forked.seed_sequence, 1)[0])
+        
+        if policy_dict:
+            forked.update_policies(policy_dict)
+        
+        return forked
+    
+    def save_checkpoint(self, path, compress=True):
+        """Guarda el estado completo del simulador en un archivo binario."""
+        return checkpoint.save_checkpoint(self, path, compress)
+    
+    @classmethod
+    def load_checkpoint(cls, path):
+        """Carga un simulador desde un archivo de checkpoint."""
+        simulator = checkpoint.load_checkpoint(path)
+        if not isinstance(simulator, cls):
+            raise ValueError("El checkpoint no contiene un simulador")
+        return simulator
+    
+    def run(self, iterations=1, periods=100, log_level=None, convergence=None, profile=False):
+        """
+        Ejecuta la simulación con los parámetros configurados.
+        
+        La primera iteración continúa desde el estado actual del motor (por
+        ejemplo, tras burn_in o fork); las siguientes empiezan desde cero. En
+        modo "ensemble" las iteraciones se simulan a la vez como réplicas de
+        un único motor.
+        
+        Args:
+            iterations: Número de iteraciones independientes
+            periods: Períodos por iteración
+            log_level: Nivel de detalle del registro ("off", "summary", "task");
+                       si no se indica se mantiene el configurado en el escenario
+            convergence: Criterio de parada anticipada por iteración (ConvergenceCriterion
+                         o diccionario con sus parámetros); None ejecuta todos los períodos
+            profile: Medir el tiempo de cada fase de los períodos
+        
+        Returns:
+            dict: Resultados por período, registro de eventos, convergencia y
+                  tiempos por iteración e ID de la simulación
+        """
+        if not self.engine:
+            raise ValueError("El motor de simulación no ha sido inicializado")
+        
+        self._apply_log_level(log_level)
+        
+        if self.engine_class is EnsembleSimulationEngine:
+            return self._run_ensemble(iterations, periods, convergence, profile)
+        
+        convergence = make_convergence(convergence)
         results = []
-        logs = []
+        convergence_reports = []
+        timings = []
+        logs = LogView()
+        
+        # Un flujo aleatorio independiente por iteración
+        iteration_seeds = spawn_seeds(self.seed_sequence, iterations)
         
         for i in range(iterations):
             # Reiniciar el motor para cada iteración
-            if i > 0:
-                self.engine = SimulationEngine(
-                    self.organization,
-                    self.policies,
-                    self.engine.organization.capital,
-                    self.engine.market_volatility
-                )
+            self._start_iteration(i, iteration_seeds[i])
+            
+            if profile:
+                self.engine.enable_profiling()
             
             # Ejecutar simulación
-            sim_result = self.engine.run_simulation(periods)
+            sim_result = self.engine.run_simulation(periods, convergence)
+            
+            # Agregar resultados (DataFrame por iteración sobre los arreglos del motor)
+            iteration_df = sim_result["results"]
+            iteration_df["iteration"] = i + 1
+            results.append(iteration_df)
             
-            # Agregar resultados
-            for period_result in sim_result["results"]:
-                period_result["iteration"] = i + 1
-                results.append(period_result)
+            # Agregar el registro de eventos (se formatea al leerlo)
+            logs.add(f"[Iteración {i+1}] ", sim_result["logs"])
             
-            # Agregar logs
-            for log in sim_result["logs"]:
-                logs.append(f"[Iteración {i+1}] {log}")
+            if convergence is not None:
+                convergence_reports.append(dict(sim_result["convergence"], iteration=i + 1))
+            
+            if profile:
+                timings.append(dict(sim_result["timings"], iteration=i + 1))
+                self.engine.disable_profiling()
         
-        # Crear DataFrame de resultados
-        results_df = pd.DataFrame(results)
+        # Unir los resultados de todas las iteraciones
+        results_df = results[0] if iterations == 1 else pd.concat(results, ignore_index=True)
         
         return {
             "results_df": results_df,
             "logs": logs,
+            "convergence": convergence_reports if convergence is not None else None,
+            "timings": timings if profile else None,
+            "simulation_id": self.simulation_id
+        }
+    
+    def iter_run(self, iterations=1, periods=100, log_level=None, keep_history=False):
+        """
+        Ejecuta la simulación como generador de resúmenes por período.
+        
+        Cada resumen se entrega en cuanto se calcula, con la iteración a la
+        que pertenece; quien lo consume puede informar del progreso o
+        detenerse en cualquier momento. En modo "ensemble" se entrega la media
+        entre réplicas de cada período.
+        
+        Args:
+            iterations: Número de iteraciones independientes
+            periods: Períodos por iteración
+            log_level: Nivel de detalle del registro ("off", "summary", "task")
+            keep_history: Conservar las métricas de todos los períodos en el motor;
+                          si es False la memoria es constante
+        
+        Yields:
+            dict: Resumen de cada período
+        """
+        if not self.engine:
+            raise ValueError("El motor de simulación no ha sido inicializado")
+        
+        self._apply_log_level(log_level)
+        
+        if self.engine_class is EnsembleSimulationEngine:
+            self._prepare_ensemble(iterations)
+            yield from self.engine.iter_periods(periods, keep_history)
+            return
+        
+        iteration_seeds = spawn_seeds(self.seed_sequence, iterations)
+        for i in range(iterations):
+            self._start_iteration(i, iteration_seeds[i])
+            
+            engine_periods = self.engine.iter_periods(periods, keep_history)
+            try:
+                for summary in engine_periods:
+                    summary["iteration"] = i + 1
+                    yield summary
+            finally:
+                engine_periods.close()
+    
+    def _apply_log_level(self, log_level):
+        # Cambiar el nivel de registro del motor actual y de los que se creen después
+        if log_level is not None:
+            self.engine_options["log_level"] = log_level
+            self.engine.events.set_level(log_level)
+    
+    def _start_iteration(self, index, seed):
+        """Prepara el motor de una iteración: la primera continúa el actual, las demás empiezan desde cero."""
+        if index > 0:
+            self.engine = self.engine_class(
+                self.organization,
+                self.policies,
+                self.engine.organization.capital,
+                self.engine.market_volatility,
+                seed=seed,
+                **self.engine_options
+            )
+        else:
+            self.engine.reseed(seed)
+    
+    def _prepare_ensemble(self, replicas):
+        """Prepara el motor de conjunto con una réplica por iteración."""
+        seed = spawn_seeds(self.seed_sequence, 1)[0]
+        if self.engine.replicas != replicas:
+            if self.engine.current_period > 0:
+                raise ValueError("No se puede cambiar el número de réplicas de una simulación iniciada")
+            self.engine = EnsembleSimulationEngine(
+                self.organization,
+                self.policies,
+                self.engine.organization.capital,
+                self.engine.market_volatility,
+                replicas=replicas,
+                seed=seed,
+                **self.engine_options
+            )
+        else:
+            self.engine.reseed(seed)
+    
+    def _run_ensemble(self, iterations, periods, convergence, profile):
+        """Ejecuta todas las iteraciones como réplicas de un motor de conjunto."""
+        self._prepare_ensemble(iterations)
+        
+        if profile:
+            self.engine.enable_profiling()
+        
+        sim_result = self.engine.run_simulation(periods, convergence)
+        
+        if profile:
+            self.engine.disable_profiling()
+        
+        logs = LogView()
+        logs.add("[Conjunto] ", sim_result["logs"])
+        
+        return {
+            "results_df": sim_result["replica_results"],
+            "logs": logs,
+            "convergence": [sim_result["convergence"]] if convergence is not None else None,
+            "timings": [sim_result["timings"]] if profile else None,
             "simulation_id": self.simulation_id
         }
\ No newline at end of file
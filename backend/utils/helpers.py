@@ -30,6 +30,10 @@ def save_simulation_results(results, simulation_id, path=None):
         results["results_df_dict"] = results["results_df"].to_dict(orient="records")
         del results["results_df"]
     
+    # Convertir el registro de eventos a líneas de texto
+    if "logs" in results and not isinstance(results["logs"], list):
+        results["logs"] = list(results["logs"])
+    
     # Guardar resultados
     with open(path, 'w', encoding='utf-8') as f:
         json.dump(results, f, indent=2)
@@ -99,7 +99,7 @@ def show_organizational_policies():
         st.subheader("Task Allocation Rules")
         task_allocation = st.selectbox(
             "Task Allocation Method",
-            options=["Skill-based", "Availability-based", "Random", "Balanced"],
+            options=["Skill-based", "Availability-based", "Random", "Balanced", "Optimal"],
             index=0,
             help="Method used to assign tasks to agents"
         )
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from backend.core.engine import Task
+from backend.models.allocation import SkillAllocator, balanced_assignment, skill_based_strategy
+
+class Worker:
+    """Worker mínimo con los atributos que usa SkillAllocator."""
+    
+    def __init__(self, agent_id, knowledge_level):
+        self.agent_id = agent_id
+        self.knowledge_level = knowledge_level
+
+def reference_balanced(knowledge, difficulty):
+    # Implementación original: puntúa cada par tarea-agente recontando la carga
+    assignments = []
+    for task_difficulty in difficulty:
+        scores = []
+        for agent, agent_knowledge in enumerate(knowledge):
+            workload = len([a for a in assignments if a == agent])
+            scores.append((agent, 0.8 * (agent_knowledge / task_difficulty) + 0.2 * (1.0 / (workload + 1))))
+        assignments.append(max(scores, key=lambda x: x[1])[0])
+    return assignments
+
+@pytest.mark.parametrize("seed", range(20))
+def test_balanced_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    for trial in range(20):
+        num_agents = int(rng.integers(1, 15))
+        num_tasks = int(rng.integers(0, 40))
+        # Valores discretos para forzar empates además de valores continuos
+        if trial % 2:
+            knowledge = rng.choice([0.3, 0.5, 0.7], num_agents)
+            difficulty = rng.choice([0.2, 0.5, 0.8], num_tasks)
+        else:
+            knowledge = rng.uniform(0.1, 1.0, num_agents)
+            difficulty = rng.uniform(0.1, 1.0, num_tasks)
+        
+        expected = reference_balanced(knowledge.tolist(), difficulty.tolist())
+        assert balanced_assignment(knowledge, difficulty).tolist() == expected
+
+@pytest.mark.parametrize("seed", range(20))
+def test_skill_allocator_matches_strategy(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(10):
+        num_tasks = int(rng.integers(0, 30))
+        num_workers = int(rng.integers(1, 8))
+        capacity = int(rng.integers(1, 4))
+        difficulty = rng.choice([0.3, 0.5, 0.7], num_tasks)
+        importance = rng.choice([0.2, 0.6], num_tasks)
+        knowledge = rng.choice([0.4, 0.6, 0.8], num_workers)
+        
+        tasks = [Task(i, difficulty[i], importance[i]) for i in range(num_tasks)]
+        workers = [Worker(100 + j, knowledge[j]) for j in range(num_workers)]
+        allocated = SkillAllocator(tasks).allocate(workers, capacity)
+        
+        chosen = skill_based_strategy(
+            {"difficulty": difficulty, "importance": importance},
+            {"knowledge": knowledge, "productivity": np.ones(num_workers)},
+            np.zeros(num_workers), capacity, rng
+        )
+        expected = {task: 100 + int(agent) for task, agent in enumerate(chosen.tolist()) if agent >= 0}
+        assert allocated == expected
+
+def test_skill_allocator_incremental_ranking():
+    rng = np.random.default_rng(0)
+    allocator = SkillAllocator()
+    workers = [Worker(j, float(rng.choice([0.2, 0.5, 0.8]))) for j in range(20)]
+    for _ in range(50):
+        for worker in rng.choice(workers, 3):
+            worker.knowledge_level = float(rng.choice([0.2, 0.5, 0.8, 0.9]))
+        assert allocator.rank_workers(workers) == SkillAllocator().rank_workers(workers)
+
+def test_skill_allocator_rejects_zero_capacity():
+    with pytest.raises(ValueError):
+        SkillAllocator([Task(0)]).allocate([Worker(1, 0.5)], capacity=0)
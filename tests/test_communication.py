@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from backend.models.communication import sample_pairs
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 7, 50])
+def test_sample_pairs_all_pairs_with_p_one(n):
+    i, j = sample_pairs(n, 1.0, np.random.default_rng(0))
+    assert list(zip(i.tolist(), j.tolist())) == [(a, b) for b in range(n) for a in range(b)]
+
+def test_sample_pairs_empty_with_p_zero():
+    i, j = sample_pairs(20, 0.0, np.random.default_rng(0))
+    assert len(i) == 0 and len(j) == 0
+
+@pytest.mark.parametrize("p", [1e-19, 1e-30])
+def test_sample_pairs_tiny_p(p):
+    # Los saltos geométricos saturan int64 y no deben desbordar la suma
+    with np.errstate(all="raise"):
+        i, j = sample_pairs(1000, p, np.random.default_rng(0))
+    assert len(i) == 0 and len(j) == 0
+
+def test_sample_pairs_uniform():
+    # Cada par debe aparecer con probabilidad p, de forma independiente del resto
+    rng = np.random.default_rng(0)
+    n, p, repeats = 30, 0.1, 4000
+    counts = np.zeros((n, n))
+    sizes = []
+    for _ in range(repeats):
+        i, j = sample_pairs(n, p, rng)
+        assert (i < j).all() and (j < n).all()
+        assert len(set(zip(i.tolist(), j.tolist()))) == len(i)
+        counts[i, j] += 1
+        sizes.append(len(i))
+    
+    frequency = counts[np.triu_indices(n, 1)] / repeats
+    pairs = n * (n - 1) // 2
+    error = np.sqrt(p * (1 - p) / repeats)
+    assert abs(frequency.mean() - p) < 3 * error / np.sqrt(pairs)
+    assert np.abs(frequency - p).max() < 5 * error
+    # Número de aristas binomial(pares, p)
+    assert abs(np.var(sizes) - pairs * p * (1 - p)) < 0.1 * pairs * p * (1 - p)
+
+def test_sample_pairs_large_indices():
+    n = 50000
+    i, j = sample_pairs(n, 0.001, np.random.default_rng(0))
+    assert ((i >= 0) & (i < j) & (j < n)).all()
+    # Ordenados por j y después por i
+    assert (np.diff(j * n + i) > 0).all()
+    assert abs(len(i) - 0.001 * n * (n - 1) / 2) < 5 * np.sqrt(0.001 * n * (n - 1) / 2)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from backend.core.engine import Task
+from backend.core.history import HISTORY_COLUMNS, TaskHistoryStore
+
+def completed_task(task_id):
+    task = Task(task_id, difficulty=0.5, importance=0.5)
+    task.status = "completed"
+    task.assigned_to = task_id % 7
+    return task
+
+def block(start, size):
+    ids = np.arange(start, start + size)
+    return {name: np.zeros(size, dtype=dtype) for name, dtype in HISTORY_COLUMNS.items()} | {"task_id": ids}
+
+def in_memory(store):
+    return sum(len(chunk["task_id"]) for chunk in store.chunks)
+
+@pytest.mark.parametrize("window", [1, 50, 100, 5000])
+def test_window_bounds_records_in_memory(window):
+    store = TaskHistoryStore(window)
+    for task_id in range(3000):
+        store.append(completed_task(task_id), task_id // 10)
+        assert in_memory(store) <= window
+        assert store._buffered < store.chunk_size <= window
+    
+    store.flush()
+    assert in_memory(store) <= window
+    assert (window < 3000) == bool(store.segments)
+    assert store.column("task_id").tolist() == list(range(3000))
+
+def test_window_splits_large_blocks():
+    # Un período del motor vectorizado puede completar más tareas que la ventana
+    store = TaskHistoryStore(50)
+    start = 0
+    for size in [10, 400, 3, 120]:
+        store.append_columns(**block(start, size))
+        start += size
+        assert in_memory(store) <= 50
+    
+    store.flush()
+    assert in_memory(store) <= 50
+    assert len(store.recent()) == in_memory(store)
+    assert store.column("task_id").tolist() == list(range(start))
+
+def test_no_window_keeps_everything_in_memory():
+    store = TaskHistoryStore(None)
+    store.append_columns(**block(0, 5000))
+    store.flush()
+    assert in_memory(store) == 5000
+    assert not store.segments